@@ -0,0 +1,95 @@
+"""Command line maintenance tasks: ``python -m app.cli <command>``."""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from app.services import columnar_store
+
+
+def _default_data_dir() -> Path:
+    from app.config import settings
+
+    return Path(settings.data_dir)
+
+
+def convert_data(args: argparse.Namespace) -> int:
+    if not columnar_store.is_available():
+        print("pyarrow is not installed; nothing to convert.")
+        return 1
+
+    data_dir = Path(args.data_dir) if args.data_dir else _default_data_dir()
+    started = time.perf_counter()
+    for csv_path, converted in columnar_store.convert_directory(data_dir, force=args.force):
+        status = "converted" if converted else "up to date"
+        print(f"{csv_path.name}: {status} -> {columnar_store.sidecar_path(csv_path)}")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def train_models(args: argparse.Namespace) -> int:
+    from app.services import model_store, training
+
+    if not model_store.is_available():
+        print("joblib/scikit-learn are not installed; cannot train models.")
+        return 1
+
+    data_dir = Path(args.data_dir) if args.data_dir else _default_data_dir()
+    history = Path(args.dataset) if args.dataset else data_dir / training.HISTORY_FILE
+    started = time.perf_counter()
+    report = training.train(
+        history,
+        data_dir,
+        workers=args.workers,
+        horizon=args.horizon,
+        anomaly=not args.skip_anomaly,
+        forecast=not args.skip_forecast,
+        per_unit=not args.no_units,
+        backend=args.backend,
+        write_outputs=not args.no_outputs,
+    )
+    for kind, version in report.versions.items():
+        print(f"{kind} models: version {version} -> {model_store.models_dir() / kind / version}")
+    for path in report.outputs:
+        print(f"wrote {path}")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="RefineryIQ maintenance tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert-data", help="Build Arrow sidecars for every CSV in data_dir")
+    convert.add_argument("--data-dir", help="Directory to convert (defaults to settings.data_dir)")
+    convert.add_argument("--force", action="store_true", help="Rebuild sidecars even if they are fresh")
+    convert.set_defaults(handler=convert_data)
+
+    train = commands.add_parser("train", help="Train anomaly and forecast models and write their outputs")
+    train.add_argument("--dataset", help="Historical readings CSV (defaults to the one in data_dir)")
+    train.add_argument("--data-dir", help="Where outputs are written (defaults to settings.data_dir)")
+    train.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Processes for model fits (1 = sequential)"
+    )
+    train.add_argument("--horizon", type=int, default=30, help="Days of forecast written to the forecast CSVs")
+    train.add_argument(
+        "--backend", choices=["auto", "prophet", "fallback"], default="auto", help="Forecast model backend"
+    )
+    train.add_argument("--skip-anomaly", action="store_true", help="Do not train the Isolation Forest models")
+    train.add_argument("--skip-forecast", action="store_true", help="Do not train the forecast models")
+    train.add_argument("--no-units", action="store_true", help="Only train plant-wide models")
+    train.add_argument("--no-outputs", action="store_true", help="Save models without rewriting the CSVs in data_dir")
+    train.set_defaults(handler=train_models)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,12 +13,69 @@ class Settings(BaseSettings):
     fastapi_port: int = 8000
     mongo_uri: str
     mongo_db: str = "refineryIQ"
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int | None = None
+    mongo_server_selection_timeout_ms: int = 10000
+    mongo_connect_timeout_ms: int = 10000
+    mongo_socket_timeout_ms: int | None = None
+    mongo_compressors: str | None = None
+    mongo_read_preference: str = "primary"
+    mongo_slow_op_ms: float | None = None
+    mongo_slow_op_capacity: int = 100
+    chat_log_ttl_days: int = 90
+    chat_log_batch_size: int = 100
+    chat_log_flush_interval_seconds: float = 1.0
+    chat_log_buffer_size: int = 10000
+    chat_log_put_timeout_seconds: float = 0.05
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
     client_url: str = "http://localhost:5173"
     gemini_api_key: str | None = None
+    gemini_model: str = "gemini-1.5-flash"
+    llm_backend: str = "gemini"
+    llm_timeout_seconds: float = 30
+    llm_stream_idle_timeout_seconds: float = 15
+    llm_max_concurrency: int = 8
+    llm_queue_timeout_seconds: float = 5
+    fake_llm_delay_ms: float = 200
+    chatbot_cache_enabled: bool = True
+    chatbot_cache_max_entries: int = 512
+    chatbot_cache_ttl_seconds: float = 900
+    chatbot_cache_similarity: float | None = None
+    chatbot_context_token_budget: int = 1200
+    chatbot_context_top_n: int = 10
     data_dir: str = str(DEFAULT_DATA_DIR)
+    dataset_cache_max_mb: int = 512
+    columnar_sidecars: bool = True
+    stream_chunk_size: int = 500
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    models_dir: str | None = None
+    score_max_batch: int = 100_000
+    forecast_cache_max_entries: int = 256
+    forecast_max_horizon: int = 730
+    ingest_buffer_capacity: int = 65536
+    ingest_max_units: int = 256
+    ingest_max_batch: int = 100_000
+    alert_queue_size: int = 256
+    alert_max_subscribers: int = 1000
+    alert_heartbeat_seconds: float = 15
+    alert_poll_seconds: float = 5
+    io_workers: int = 8
+    cpu_workers: int = 0
+    kpi_snapshot_enabled: bool = True
+    kpi_snapshot_interval_seconds: float = 300
+    kpi_snapshot_batch_size: int = 1000
+    kpi_snapshot_ttl_days: int = 30
 
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"),
@@ -0,0 +1,93 @@
+"""Index definitions for every collection, ensured idempotently at startup."""
+from __future__ import annotations
+
+import logging
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KPI_FIELDS = ("total_energy", "avg_energy", "avg_sec", "anomaly_rate")
+
+# Server error codes raised when an index with the same name or keys already exists with other options.
+_INDEX_CONFLICT_CODES = {85, 86}
+
+
+def required_indexes() -> dict[str, list[IndexModel]]:
+    return {
+        "users": [
+            # Hit by every login and register.
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        ],
+        "kpi_snapshots": [
+            # Serves /kpis/summary and, because every projected field is in the key,
+            # /kpis/snapshots as a covered index scan.
+            IndexModel(
+                [
+                    ("granularity", ASCENDING),
+                    ("timestamp", DESCENDING),
+                    *((name, ASCENDING) for name in KPI_FIELDS),
+                    ("_id", ASCENDING),
+                ],
+                name="granularity_timestamp_kpis",
+            ),
+            IndexModel(
+                [("granularity", ASCENDING), ("key", ASCENDING)],
+                name="rollup_key",
+                unique=True,
+                partialFilterExpression={"key": {"$exists": True}},
+            ),
+            # One overall snapshot is inserted per writer run; expire old ones. Rollups are
+            # upserted in place and older documents without a granularity are left alone.
+            IndexModel(
+                [("timestamp", ASCENDING)],
+                name="overall_timestamp_ttl",
+                expireAfterSeconds=settings.kpi_snapshot_ttl_days * 24 * 60 * 60,
+                partialFilterExpression={"granularity": "overall"},
+            ),
+        ],
+        "chatbot_logs": [
+            IndexModel(
+                [("created_at", ASCENDING)],
+                name="created_at_ttl",
+                expireAfterSeconds=settings.chat_log_ttl_days * 24 * 60 * 60,
+            ),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+        ],
+    }
+
+
+async def _ensure_index(db, collection: str, index: IndexModel) -> None:
+    try:
+        await db[collection].create_indexes([index])
+    except OperationFailure as exc:
+        if exc.code not in _INDEX_CONFLICT_CODES:
+            raise
+        document = index.document
+        if "expireAfterSeconds" in document:
+            # Only the TTL changed: update it in place instead of rebuilding the index.
+            await db.command(
+                "collMod",
+                collection,
+                index={"name": document["name"], "expireAfterSeconds": document["expireAfterSeconds"]},
+            )
+            logger.info("Updated TTL of %s.%s", collection, document["name"])
+        else:
+            logger.warning("Index %s.%s exists with different options: %s", collection, document["name"], exc)
+
+
+async def ensure_indexes(db) -> None:
+    """Create any missing index; existing identical indexes are left untouched.
+
+    A server-side failure on one index (duplicate keys under a unique index, say) is
+    logged and the remaining indexes are still created. Connection errors propagate.
+    """
+    for collection, indexes in required_indexes().items():
+        for index in indexes:
+            try:
+                await _ensure_index(db, collection, index)
+            except OperationFailure as exc:
+                logger.error("Could not create index %s.%s: %s", collection, index.document["name"], exc)
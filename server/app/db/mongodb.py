@@ -1,18 +1,57 @@
 from __future__ import annotations
 
+import logging
+import time
+from typing import Any
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
 
 from app.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.pool_metrics import PoolMetricsListener
+from app.db.profiling import SlowOperationListener
+
+logger = logging.getLogger(__name__)
 
 client: AsyncIOMotorClient | None = None
 _db = None
+slow_operations: SlowOperationListener | None = None
+pool_metrics = PoolMetricsListener()
+
+
+def client_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+    }
+    if settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_socket_timeout_ms is not None:
+        options["socketTimeoutMS"] = settings.mongo_socket_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
 
 
 async def connect_to_mongo() -> None:
-    global client, _db
-    client = AsyncIOMotorClient(settings.mongo_uri)
+    global client, _db, slow_operations
+    listeners: list[Any] = [pool_metrics]
+    if settings.mongo_slow_op_ms is not None:
+        slow_operations = SlowOperationListener(settings.mongo_slow_op_ms, settings.mongo_slow_op_capacity)
+        listeners.append(slow_operations)
+    client = AsyncIOMotorClient(settings.mongo_uri, event_listeners=listeners, **client_options())
     _db = client[settings.mongo_db]
 
+    try:
+        await ensure_indexes(_db)
+    except PyMongoError as exc:
+        # The API can still serve CSV-backed endpoints while Mongo is unreachable.
+        logger.warning("Could not ensure Mongo indexes: %s", exc)
+
 
 async def close_mongo_connection() -> None:
     if client:
@@ -21,3 +60,12 @@ async def close_mongo_connection() -> None:
 
 def get_db():
     return _db
+
+
+async def ping() -> dict[str, Any]:
+    """Round-trip a ``ping`` to the server; raises ``PyMongoError`` if it is unreachable."""
+    if _db is None:
+        raise ConnectionError("Mongo client is not initialised")
+    started = time.perf_counter()
+    await _db.command("ping")
+    return {"latency_ms": (time.perf_counter() - started) * 1000}
@@ -0,0 +1,93 @@
+"""Connection pool utilisation metrics collected from pymongo pool events."""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Any
+
+from pymongo import monitoring
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, dict[str, float]] = defaultdict(
+            lambda: {
+                "open": 0,
+                "in_use": 0,
+                "peak_in_use": 0,
+                "created": 0,
+                "closed": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checkout_wait_ms_total": 0.0,
+                "checkout_wait_ms_max": 0.0,
+                "cleared": 0,
+            }
+        )
+
+    def _pool(self, address: tuple[str, int]) -> dict[str, float]:
+        return self._pools[f"{address[0]}:{address[1]}"]
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)["cleared"] += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with self._lock:
+            self._pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open"] += 1
+            pool["created"] += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open"] = max(0, pool["open"] - 1)
+            pool["closed"] += 1
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)["checkout_failures"] += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        # ``duration`` (seconds spent waiting for the connection) exists on pymongo >= 4.7.
+        wait_ms = getattr(event, "duration", 0.0) * 1000
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["in_use"] += 1
+            pool["peak_in_use"] = max(pool["peak_in_use"], pool["in_use"])
+            pool["checkouts"] += 1
+            pool["checkout_wait_ms_total"] += wait_ms
+            pool["checkout_wait_ms_max"] = max(pool["checkout_wait_ms_max"], wait_ms)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["in_use"] = max(0, pool["in_use"] - 1)
+
+    def snapshot(self, max_pool_size: int) -> dict[str, Any]:
+        with self._lock:
+            pools = {address: dict(values) for address, values in self._pools.items()}
+        for values in pools.values():
+            values["utilisation"] = values["in_use"] / max_pool_size if max_pool_size else None
+            values["checkout_wait_ms_avg"] = (
+                values["checkout_wait_ms_total"] / values["checkouts"] if values["checkouts"] else 0.0
+            )
+        return {"max_pool_size": max_pool_size, "pools": pools}
@@ -0,0 +1,137 @@
+"""Slow Mongo operation recorder, enabled with ``MONGO_SLOW_OP_MS``.
+
+A pymongo command listener keeps the most recent operations slower than the
+threshold. Only the command name, collection and the shape of the command
+are kept: values in filters, update bodies and pipelines are replaced with
+``REDACTED``, so no user data (emails, password hashes) ends up in the report.
+Query plans are fetched lazily with ``explain`` of that redacted command when
+the report is requested (the plan depends on the fields and operators, not on
+the values), so collection scans show up as ``COLLSCAN`` stages.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from bson import json_util
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+REDACTED = "?"
+# Command fields that only describe the shape of the operation and are kept as they are.
+_SHAPE_FIELDS = {"sort", "projection", "fields", "hint", "limit", "skip", "key", "cursor", "new", "remove", "upsert"}
+# Fields that carry values (filters, update bodies, pipelines); only their keys are kept.
+_VALUE_FIELDS = {"filter", "query", "update", "pipeline"}
+# Per-statement fields of update/delete commands.
+_STATEMENT_VALUE_FIELDS = {"q", "u"}
+# Pipeline stages whose arguments are field names, directions or sizes rather than values.
+_SHAPE_STAGES = {"$sort", "$limit", "$skip", "$sample", "$count"}
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return REDACTED
+
+
+def _redact_stage(stage: Any) -> Any:
+    if isinstance(stage, dict):
+        return {name: argument if name in _SHAPE_STAGES else _redact(argument) for name, argument in stage.items()}
+    return _redact(stage)
+
+
+def redact_command(name: str, command: dict[str, Any]) -> dict[str, Any]:
+    """``command`` reduced to its collection and shape, with every user-supplied value redacted."""
+    redacted: dict[str, Any] = {name: command.get(name)}
+    for key, value in command.items():
+        if key == name:
+            continue
+        if key in _SHAPE_FIELDS:
+            redacted[key] = value
+        elif key == "pipeline":
+            redacted[key] = [_redact_stage(stage) for stage in value]
+        elif key in _VALUE_FIELDS:
+            redacted[key] = _redact(value)
+        elif key in ("updates", "deletes"):
+            redacted[key] = [
+                {field: _redact(item) if field in _STATEMENT_VALUE_FIELDS else item for field, item in statement.items()}
+                for statement in value
+            ]
+    return redacted
+
+
+def _plan_stages(plan: dict[str, Any]) -> list[str]:
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+class SlowOperationListener(monitoring.CommandListener):
+    def __init__(self, threshold_ms: float, capacity: int = 100) -> None:
+        self.threshold_ms = threshold_ms
+        self.operations: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._started: dict[tuple[Any, int], dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        command = redact_command(event.command_name, event.command)
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = {
+                "database": event.database_name,
+                "collection": command[event.command_name],
+                "command": command,
+            }
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if started is None or duration_ms < self.threshold_ms:
+            return
+        self.operations.append(
+            {
+                "command_name": event.command_name,
+                "database": started["database"],
+                "collection": started["collection"],
+                "duration_ms": duration_ms,
+                "command": started["command"],
+                "recorded_at": datetime.now(timezone.utc),
+                "plan": None,
+            }
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        with self._lock:
+            self._started.pop((event.connection_id, event.request_id), None)
+
+    async def report(self, client) -> list[dict[str, Any]]:
+        """Recorded slow operations, explaining any that have not been explained yet."""
+        for operation in list(self.operations):
+            if operation["plan"] is not None:
+                continue
+            try:
+                explained = await client[operation["database"]].command(
+                    "explain", operation["command"], verbosity="queryPlanner"
+                )
+            except PyMongoError as exc:
+                operation["plan"] = {"error": str(exc)}
+                continue
+            winning = explained.get("queryPlanner", {}).get("winningPlan", {})
+            stages = _plan_stages(winning)
+            operation["plan"] = {"stages": stages, "collection_scan": "COLLSCAN" in stages}
+        return [
+            {**operation, "command": json.loads(json_util.dumps(operation["command"]))}
+            for operation in self.operations
+        ]
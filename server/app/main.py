@@ -1,18 +1,35 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+from typing import Any
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from pymongo.errors import PyMongoError
 
 from app.config import settings
-from app.db.mongodb import close_mongo_connection, connect_to_mongo
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_db, ping
 from app.routes.anomaly_routes import router as anomaly_router
 from app.routes.auth_routes import router as auth_router
 from app.routes.chatbot_routes import router as chatbot_router
 from app.routes.forecast_routes import router as forecast_router
+from app.routes.history_routes import router as history_router
+from app.routes.ingest_routes import router as ingest_router
 from app.routes.kpi_routes import router as kpi_router
+from app.routes.metrics_routes import router as metrics_router
 from app.routes.recommendation_routes import router as recommendation_router
+from app.services.alert_hub import alert_hub
+from app.services.alert_watcher import start_alert_watcher, stop_alert_watcher
+from app.services.chat_log_writer import start_chat_log_writer, stop_chat_log_writer
+from app.services.compression import CompressionMiddleware
+from app.services.executor import shutdown_executors
+from app.services.json_codec import FastJSONResponse
+from app.services.llm_client import start_llm_client, stop_llm_client
+from app.services.passwords import hashing_pool
+from app.services.snapshot_writer import start_snapshot_writer, stop_snapshot_writer
+from app.services.time_index import NEXT_CURSOR_HEADER
 
-app = FastAPI(title="RefineryIQ API", version="1.0.0")
+app = FastAPI(title="RefineryIQ API", version="1.0.0", default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,17 +37,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+    )
 
 
 @app.on_event("startup")
 async def startup() -> None:
     await connect_to_mongo()
+    start_snapshot_writer(get_db())
+    start_chat_log_writer(get_db())
+    start_llm_client()
+    start_alert_watcher()
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
+    await stop_alert_watcher()
+    alert_hub.close()
+    await stop_snapshot_writer()
+    await stop_chat_log_writer()
+    stop_llm_client()
     await close_mongo_connection()
+    shutdown_executors()
+    hashing_pool.shutdown()
 
 
 @app.get("/health")
@@ -38,9 +74,24 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+async def readiness() -> Any:
+    try:
+        mongo = await ping()
+    except (PyMongoError, ConnectionError) as exc:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "mongo": {"error": str(exc)}},
+        )
+    return {"status": "ok", "mongo": mongo}
+
+
 app.include_router(auth_router)
 app.include_router(kpi_router)
 app.include_router(anomaly_router)
 app.include_router(forecast_router)
+app.include_router(history_router)
+app.include_router(ingest_router)
 app.include_router(recommendation_router)
 app.include_router(chatbot_router)
+app.include_router(metrics_router)
@@ -44,19 +44,63 @@ class KPISnapshot(KPISummary):
     id: str | None = None
 
 
+class LiveKPI(BaseModel):
+    unit: str
+    readings: int
+    start: datetime
+    end: datetime
+    total_energy: float | None = None
+    avg_energy: float | None = None
+    avg_sec: float | None = None
+
+
+class KPIGroup(BaseModel):
+    key: str
+    readings: int
+    total_energy: float | None = None
+    avg_energy: float | None = None
+    avg_sec: float | None = None
+    anomaly_rate: float | None = None
+
+
 class Alert(BaseModel):
     id: str | None = None
     message: str
     severity: str
     timestamp: datetime | None = None
+    unit: str | None = None
+    score: float | None = None
     source: str | None = None
 
 
 class ForecastRecord(BaseModel):
     timestamp: str | None = None
     value: float | None = None
+    lower: float | None = None
+    upper: float | None = None
     metric: str | None = None
-    raw: dict[str, Any]
+    raw: dict[str, Any] | None = None
+    # Set on week/month points: period_start, resolution and min/max/count of the daily values.
+    rollup: dict[str, Any] | None = None
+
+
+class HistoryPoint(BaseModel):
+    timestamp: str
+    value: float | None = None
+    count: int
+    sum: float | None = None
+    mean: float | None = None
+    min: float | None = None
+    max: float | None = None
+    p95: float | None = None
+
+
+class HistorySeries(BaseModel):
+    metric: str
+    unit: str
+    resolution: str
+    stat: str
+    points: list[HistoryPoint]
 
 
 class Recommendation(BaseModel):
@@ -70,11 +114,26 @@ class Recommendation(BaseModel):
 class AnomalyRecord(BaseModel):
     timestamp: str | None = None
     score: float | None = None
+    unit: str | None = None
+    severity: str | None = None
     raw: dict[str, Any]
 
 
+class UnitAnomalySummary(BaseModel):
+    unit: str
+    readings: int
+    anomalies: int
+    anomaly_rate: float
+    severity_counts: dict[str, int]
+    score_min: float | None = None
+    score_mean: float | None = None
+    score_max: float | None = None
+    last_anomaly_at: datetime | None = None
+
+
 class ChatbotRequest(BaseModel):
     message: str = Field(min_length=1)
+    # Optional extra context; KPIs, alerts and recommendations are assembled server-side.
     context: dict[str, Any] | None = None
     user_id: str | None = None
 
@@ -83,6 +142,7 @@ class ChatbotResponse(BaseModel):
     reply: str
     created_at: datetime
     model: str | None = None
+    cached: bool = False
 
 
 class ChatbotLog(BaseModel):
@@ -91,3 +151,39 @@ class ChatbotLog(BaseModel):
     response: str
     created_at: datetime
     context: dict[str, Any] | None = None
+
+
+class ScoreReading(BaseModel):
+    timestamp: str | None = None
+    unit_name: str | None = None
+    electricity_kwh: float | None = None
+    steam_usage: float | None = None
+    fuel_usage: float | None = None
+    production_tons: float | None = None
+
+
+class ScoreRequest(BaseModel):
+    readings: list[ScoreReading] = Field(min_length=1)
+
+
+class ScoredReading(BaseModel):
+    timestamp: str | None = None
+    unit: str | None = None
+    SEC: float | None = None
+    score: float | None = None
+    anomaly: bool | None = None
+    severity: str | None = None
+    model: str | None = None
+
+
+class ScoreResponse(BaseModel):
+    version: str
+    results: list[ScoredReading]
+
+
+class IngestResult(BaseModel):
+    accepted: int
+    rejected: int
+    units: dict[str, int]
+    # Anomalies pushed to alert subscribers (batches are only scored while someone is subscribed).
+    alerts: int = 0
@@ -1,18 +1,174 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+import asyncio
+from datetime import datetime
 
-from app.models.schemas import Alert, AnomalyRecord
-from app.services.anomaly_service import build_alerts, load_anomalies
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+
+from app.config import settings
+from app.models.schemas import (
+    Alert,
+    AnomalyRecord,
+    ScoreRequest,
+    ScoreResponse,
+    UnitAnomalySummary,
+)
+from app.services.alert_hub import KEEPALIVE, TooManySubscribers, alert_hub
+from app.services.anomaly_service import (
+    build_alerts,
+    iter_anomalies,
+    load_anomalies,
+    load_anomaly_columns,
+    load_unit_summaries,
+)
+from app.services.anomaly_scoring import score_readings
+from app.services.columnar import COLUMNAR_RESPONSES, FORMAT_DESCRIPTION, FORMAT_PATTERN, columnar_response
+from app.services.executor import run_cpu, run_io
+from app.services.ingest_service import score_window
+from app.services.json_codec import FastJSONResponse
+from app.services.streaming import NDJSON_RESPONSES, ndjson_response, sse_frame, sse_response, wants_stream
+from app.services.time_index import NEXT_CURSOR_HEADER, decode_cursor
 
 router = APIRouter(prefix="/anomalies", tags=["anomalies"])
 
+MAX_PAGE_SIZE = 1000
+
+
+@router.get("", response_model=list[AnomalyRecord], responses={**NDJSON_RESPONSES, **COLUMNAR_RESPONSES})
+async def get_anomalies(
+    request: Request,
+    limit: int | None = Query(
+        None, ge=1, description="Page size (max 1000); unbounded when streaming or for columnar/arrow"
+    ),
+    stream: bool = Query(False, description="Stream every record as NDJSON"),
+    start: datetime | None = Query(None, description="Only records at or after this time"),
+    end: datetime | None = Query(None, description="Only records at or before this time"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    unit: str | None = Query(None, description="Only anomalies for this unit, e.g. VDU"),
+    severity: str | None = Query(None, description="Only anomalies with this severity"),
+    response_format: str = Query("records", alias="format", pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+):
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if response_format != "records":
+        columns, next_cursor = await run_io(load_anomaly_columns, limit, start, end, cursor, unit, severity)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return columnar_response(columns, response_format, headers=headers)
+
+    if wants_stream(request, stream):
+        return ndjson_response(
+            iter_anomalies(limit, settings.stream_chunk_size, start, end, cursor, unit, severity)
+        )
 
-@router.get("", response_model=list[AnomalyRecord])
-async def get_anomalies(limit: int = Query(100, ge=1, le=1000)) -> list[AnomalyRecord]:
-    return load_anomalies(limit)
+    if limit is not None and limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"limit must be <= {MAX_PAGE_SIZE} unless streaming",
+        )
+    records, next_cursor = await run_io(
+        load_anomalies, limit or 100, start, end, cursor, unit, severity
+    )
+    # AnomalyRecord-shaped already; skip validating and re-serialising each record.
+    return FastJSONResponse(records, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+
+@router.get("/units", response_model=list[UnitAnomalySummary])
+async def get_unit_summaries() -> list[UnitAnomalySummary]:
+    return await run_io(load_unit_summaries)
 
 
 @router.get("/alerts", response_model=list[Alert])
 async def get_alerts(limit: int = Query(100, ge=1, le=1000)) -> list[Alert]:
-    return build_alerts(limit)
+    return await run_io(build_alerts, limit)
+
+
+@router.get("/alerts/stream", responses={200: {"content": {"text/event-stream": {}}}})
+async def stream_alerts(
+    unit: list[str] | None = Query(None, description="Only alerts for these units (repeatable)"),
+    severity: list[str] | None = Query(None, description="Only alerts with these severities (repeatable)"),
+):
+    """Server-sent ``alerts`` events, each a JSON array of new alerts matching the filters."""
+    try:
+        subscription = alert_hub.subscribe(unit, severity)
+    except TooManySubscribers as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+
+    async def events():
+        try:
+            while (message := await subscription.next(settings.alert_heartbeat_seconds)) is not None:
+                # Comment lines keep proxies from closing an idle stream.
+                yield b": keep-alive\n\n" if message == KEEPALIVE else sse_frame("alerts", message)
+        finally:
+            alert_hub.unsubscribe(subscription)
+
+    return sse_response(events())
+
+
+@router.websocket("/alerts/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    unit: list[str] | None = Query(None),
+    severity: list[str] | None = Query(None),
+) -> None:
+    """Same feed as ``/alerts/stream``: one text message (a JSON array of alerts) per batch."""
+    await websocket.accept()
+    try:
+        subscription = alert_hub.subscribe(unit, severity)
+    except TooManySubscribers as exc:
+        await websocket.close(code=1013, reason=str(exc))
+        return
+
+    async def push() -> None:
+        while (message := await subscription.next(settings.alert_heartbeat_seconds)) is not None:
+            await websocket.send_text("[]" if message == KEEPALIVE else message)
+        await websocket.close()
+
+    sender = asyncio.create_task(push())
+    try:
+        # Nothing is expected from the client; receiving just notices when it goes away.
+        while not sender.done():
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sender.cancel()
+        alert_hub.unsubscribe(subscription)
+
+
+@router.post("/score", response_model=ScoreResponse)
+async def score_anomalies(request: ScoreRequest):
+    """Score a batch of readings with the current global and per-unit Isolation Forest models."""
+    if len(request.readings) > settings.score_max_batch:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.score_max_batch} readings per request",
+        )
+    result = await run_cpu(score_readings, [reading.model_dump() for reading in request.readings])
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No anomaly model has been trained yet",
+        )
+    version, results = result
+    return {"version": version, "results": results}
+
+
+@router.get("/live", response_model=ScoreResponse)
+async def live_anomalies(
+    unit: str | None = Query(None, description="Only this unit, e.g. VDU"),
+    window: int = Query(1000, ge=1, description="Most recent readings per unit to score"),
+    all_readings: bool = Query(False, alias="all", description="Include readings that are not anomalies"),
+):
+    """Score the most recent readings pushed through ``POST /ingest``."""
+    result = await run_io(score_window, unit, window, not all_readings)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No anomaly model has been trained yet",
+        )
+    version, results = result
+    return {"version": version, "results": results}
@@ -1,41 +1,27 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-import hashlib
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from jose import jwt
-from passlib.context import CryptContext
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 
 from app.config import settings
 from app.db.mongodb import get_db
 from app.models.schemas import Token, UserCreate, UserLogin, UserOut
+from app.services.passwords import HashingBusy, hash_password, verify_password
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# ---------------------------------
-# Password Hashing (ARGON2)
-# ---------------------------------
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto"
-)
-
-
-def _hash_password(password: str) -> str:
-    """
-    Secure password hashing:
-    - SHA-256 normalization
-    - Argon2 (no length limit, Windows-safe)
-    """
-    normalized = hashlib.sha256(password.encode("utf-8")).hexdigest()
-    return pwd_context.hash(normalized)
-
 
-def _verify_password(plain_password: str, hashed_password: str) -> bool:
-    normalized = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
-    return pwd_context.verify(normalized, hashed_password)
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
 
 
 # ---------------------------------
@@ -59,6 +45,36 @@ def _create_access_token(subject: str) -> tuple[str, int]:
     return token, int(expires_delta.total_seconds())
 
 
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def require_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> str:
+    """Subject (user id) of a valid bearer token; 401 otherwise."""
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if credentials is None:
+        raise unauthorized
+
+    try:
+        payload = jwt.decode(
+            credentials.credentials,
+            settings.jwt_secret,
+            algorithms=[settings.jwt_algorithm],
+        )
+    except JWTError:
+        raise unauthorized
+
+    subject = payload.get("sub")
+    if not subject:
+        raise unauthorized
+    return subject
+
+
 # ---------------------------------
 # Register
 # ---------------------------------
@@ -78,15 +94,27 @@ async def register(
             detail="Email already registered",
         )
 
+    try:
+        hashed_password = await hash_password(user.password)
+    except HashingBusy:
+        raise _busy()
+
     payload = {
         "email": user.email,
         "full_name": user.full_name,
         "role": user.role,
-        "hashed_password": _hash_password(user.password),
+        "hashed_password": hashed_password,
         "created_at": datetime.now(timezone.utc),
     }
 
-    result = await db.users.insert_one(payload)
+    try:
+        result = await db.users.insert_one(payload)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration; the unique email index rejected it.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already registered",
+        )
 
     return UserOut(
         id=str(result.inserted_id),
@@ -107,15 +135,29 @@ async def login(
 ) -> Token:
     user = await db.users.find_one({"email": credentials.email})
 
-    if not user or not _verify_password(
-        credentials.password,
-        user.get("hashed_password", ""),
-    ):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password(
+                credentials.password,
+                user.get("hashed_password", ""),
+            )
+        except HashingBusy:
+            raise _busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    if new_hash:
+        # Stored hash used outdated Argon2 parameters; upgrade it now that we have the password.
+        await db.users.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"hashed_password": new_hash}},
+        )
+
     token, expires_in = _create_access_token(
         subject=str(user["_id"])
     )
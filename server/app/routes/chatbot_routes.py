@@ -1,24 +1,85 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, HTTPException, status
 
-from app.db.mongodb import get_db
 from app.models.schemas import ChatbotRequest, ChatbotResponse
-from app.services.chatbot_service import build_chat_log, generate_reply
+from app.services.chat_log_writer import log_chat
+from app.services.chatbot_service import (
+    build_chat_log,
+    cached_reply,
+    generate_reply,
+    stream_reply,
+    system_prompt,
+)
+from app.services.llm_client import LLMBusy, LLMTimeout, LLMUnavailable, get_llm_client
+from app.services.streaming import SSE_MEDIA_TYPE, encode_sse, sse_response
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
 
+def _unavailable(exc: LLMUnavailable) -> HTTPException:
+    if isinstance(exc, LLMBusy):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        )
+    if isinstance(exc, LLMTimeout):
+        return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc))
+    return HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+
+
 @router.post("", response_model=ChatbotResponse)
-async def chatbot(request: ChatbotRequest, db=Depends(get_db)) -> ChatbotResponse:
-    reply, model_name = generate_reply(request.message, request.context)
+async def chatbot(request: ChatbotRequest) -> ChatbotResponse:
+    try:
+        reply, model_name, cached = await generate_reply(request.message, request.context)
+    except LLMUnavailable as exc:
+        raise _unavailable(exc)
     created_at = datetime.now(timezone.utc)
 
-    if db is not None:
-        await db.chatbot_logs.insert_one(
-            build_chat_log(request.message, reply, request.context, request.user_id)
+    await log_chat(build_chat_log(request.message, reply, request.context, request.user_id))
+
+    return ChatbotResponse(reply=reply, created_at=created_at, model=model_name, cached=cached)
+
+
+@router.post(
+    "/stream",
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}, "description": "token, done and error events."}},
+)
+async def chatbot_stream(request: ChatbotRequest):
+    """Stream the reply as server-sent events: ``token`` per chunk, then ``done`` (or ``error``)."""
+    model_name = get_llm_client().model_name
+    prompt = await system_prompt(request.context)
+    hit = cached_reply(request.message, prompt)
+
+    async def events() -> AsyncIterator[bytes]:
+        if hit is not None:
+            reply = hit.reply
+            yield encode_sse("token", {"text": reply})
+        else:
+            parts: list[str] = []
+            try:
+                async for text in stream_reply(request.message, prompt):
+                    parts.append(text)
+                    yield encode_sse("token", {"text": text})
+            except LLMUnavailable as exc:
+                yield encode_sse("error", {"detail": str(exc)})
+                return
+            reply = "".join(parts)
+
+        created_at = datetime.now(timezone.utc)
+        yield encode_sse(
+            "done",
+            {
+                "reply": reply,
+                "created_at": created_at,
+                "model": hit.model if hit is not None else model_name,
+                "cached": hit is not None,
+            },
         )
+        await log_chat(build_chat_log(request.message, reply, request.context, request.user_id))
 
-    return ChatbotResponse(reply=reply, created_at=created_at, model=model_name)
+    return sse_response(events())
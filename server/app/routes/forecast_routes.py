@@ -1,18 +1,148 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from datetime import datetime
+from typing import Any
 
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.config import settings
 from app.models.schemas import ForecastRecord
-from app.services.forecast_service import load_forecast
+from app.services.columnar import (
+    COLUMNAR_RESPONSES,
+    FORMAT_DESCRIPTION,
+    FORMAT_PATTERN,
+    columnar_response,
+    records_to_columns,
+)
+from app.services.executor import run_io
+from app.services.forecast_engine import UnknownSeries, forecast_engine, model_info
+from app.services.forecast_models import PLANT
+from app.services.forecast_service import (
+    FORECAST_COLUMNS,
+    chart_records,
+    iter_forecast,
+    load_forecast,
+    load_forecast_chart,
+    load_forecast_columns,
+)
+from app.services.json_codec import FastJSONResponse
+from app.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_stream
+from app.services.time_index import NEXT_CURSOR_HEADER, decode_cursor
 
 router = APIRouter(prefix="/forecasts", tags=["forecasts"])
 
+FORECAST_FILES = {"energy": "energy_forecast.csv", "sec": "sec_forecast.csv"}
+MAX_PAGE_SIZE = 2000
+MODEL_VERSION_HEADER = "X-Model-Version"
+NO_MODEL = "No forecast model has been trained yet; run `python -m app.cli train`"
+
 
-@router.get("", response_model=list[ForecastRecord])
+@router.get("", response_model=list[ForecastRecord], responses={**NDJSON_RESPONSES, **COLUMNAR_RESPONSES})
 async def get_forecasts(
+    request: Request,
     forecast_type: str = Query("energy", pattern="^(energy|sec)$"),
-    limit: int = Query(100, ge=1, le=2000),
-) -> list[ForecastRecord]:
-    if forecast_type == "sec":
-        return load_forecast("sec_forecast.csv", "sec", limit)
-    return load_forecast("energy_forecast.csv", "energy", limit)
+    limit: int | None = Query(
+        None, ge=1, description="Page size (max 2000); unbounded when streaming or for columnar/arrow"
+    ),
+    stream: bool = Query(False, description="Stream every record as NDJSON"),
+    start: datetime | None = Query(None, description="Only records at or after this time"),
+    end: datetime | None = Query(None, description="Only records at or before this time"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    horizon: int | None = Query(
+        None, ge=1, le=settings.forecast_max_horizon, description="Forecast this many days ahead with the trained model"
+    ),
+    unit: str | None = Query(None, description="Forecast one unit, e.g. VDU (trained model only)"),
+    resolution: str | None = Query(None, pattern="^(day|week|month)$", description="Roll daily values up"),
+    max_points: int | None = Query(
+        None, ge=3, le=10_000, description="Thin the series to this many points (LTTB); ignores limit and cursor"
+    ),
+    include_raw: bool = Query(True, description="Include each source row as `raw`"),
+    response_format: str = Query("records", alias="format", pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+):
+    columnar = response_format != "records"
+    if horizon is not None or unit is not None:
+        # A model forecast is one short series computed per request; it is not paged or filtered by time.
+        paging = {"limit": limit, "start": start, "end": end, "cursor": cursor}
+        conflicting = [name for name, value in paging.items() if value is not None]
+        if conflicting:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{', '.join(conflicting)} cannot be combined with horizon or unit",
+            )
+        version, records = await _model_forecast(forecast_type, horizon or 30, unit)
+        headers = {MODEL_VERSION_HEADER: version}
+        if resolution is not None or max_points is not None:
+            records = await run_io(chart_records, records, forecast_type, resolution, max_points)
+        if columnar:
+            return columnar_response(
+                records_to_columns(records, FORECAST_COLUMNS),
+                response_format,
+                {"metric": forecast_type, "unit": unit or PLANT, "version": version},
+                headers,
+            )
+        if not include_raw:
+            records = [{**record, "raw": None} for record in records]
+        if wants_stream(request, stream):
+            size = settings.stream_chunk_size
+            return ndjson_response((records[i : i + size] for i in range(0, len(records), size)), headers)
+        return FastJSONResponse(records, headers=headers)
+
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    file_name = FORECAST_FILES[forecast_type]
+    if resolution is not None or max_points is not None:
+        records = await run_io(load_forecast_chart, file_name, forecast_type, start, end, resolution, max_points)
+        if columnar:
+            return columnar_response(
+                records_to_columns(records, FORECAST_COLUMNS), response_format, {"metric": forecast_type}
+            )
+        return FastJSONResponse(records)
+
+    if columnar:
+        columns, next_cursor = await run_io(
+            load_forecast_columns, file_name, forecast_type, limit, start, end, cursor
+        )
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return columnar_response(columns, response_format, {"metric": forecast_type}, headers)
+
+    if wants_stream(request, stream):
+        return ndjson_response(
+            iter_forecast(
+                file_name, forecast_type, limit, settings.stream_chunk_size, start, end, cursor, include_raw
+            )
+        )
+
+    if limit is not None and limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"limit must be <= {MAX_PAGE_SIZE} unless streaming",
+        )
+    records, next_cursor = await run_io(
+        load_forecast, file_name, forecast_type, limit or 100, start, end, cursor, include_raw
+    )
+    # The service builds ForecastRecord-shaped dicts; returning the response
+    # directly skips validating and re-serialising each of them.
+    return FastJSONResponse(records, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+
+async def _model_forecast(metric: str, horizon: int, unit: str | None) -> tuple[str, list[dict]]:
+    try:
+        result = await run_io(forecast_engine.forecast, metric, horizon, unit or PLANT)
+    except UnknownSeries as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=NO_MODEL)
+    return result
+
+
+@router.get("/models")
+async def get_forecast_models() -> dict[str, Any]:
+    """Version, backend, metrics and units of the trained forecast models."""
+    info = await run_io(model_info)
+    if info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NO_MODEL)
+    return info
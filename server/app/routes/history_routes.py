@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.models.schemas import HistorySeries
+from app.services.executor import run_io
+from app.services.forecast_models import PLANT
+from app.services.json_codec import FastJSONResponse
+from app.services.rollups import load_history
+
+router = APIRouter(prefix="/history", tags=["history"])
+
+
+@router.get("", response_model=HistorySeries)
+async def get_history(
+    metric: str = Query("energy", pattern="^(energy|sec)$"),
+    unit: str = Query(PLANT, description="A unit, e.g. VDU, or 'all' for the whole plant"),
+    resolution: str = Query("auto", pattern="^(auto|raw|day|week|month)$"),
+    stat: str | None = Query(
+        None, pattern="^(sum|mean|min|max|p95)$", description="Charted value (default: sum for energy, mean for SEC)"
+    ),
+    start: datetime | None = Query(None, description="Only periods starting at or after this time"),
+    end: datetime | None = Query(None, description="Only periods starting at or before this time"),
+    max_points: int = Query(500, ge=3, le=10_000, description="Upper bound on the number of points returned"),
+):
+    """Historical energy or SEC, rolled up and thinned to at most ``max_points`` points."""
+    series = await run_io(load_history, metric, unit, resolution, stat, start, end, max_points)
+    if series is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No history for unit {unit!r}")
+    # Built in the HistorySeries shape; returned as is rather than revalidated.
+    return FastJSONResponse(series)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.models.schemas import IngestResult
+from app.services.executor import run_io
+from app.services.ingest_service import BatchTooLarge, IngestError, ingest_payload
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+@router.post(
+    "",
+    response_model=IngestResult,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            }
+        }
+    },
+)
+async def ingest_readings(request: Request):
+    """Append a batch of readings (a JSON array, ``{"readings": [...]}`` or NDJSON) to the live buffers."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await request.body()
+    try:
+        return await run_io(ingest_payload, body, content_type in NDJSON_TYPES)
+    except BatchTooLarge as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+    except IngestError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
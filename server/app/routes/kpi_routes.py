@@ -3,8 +3,15 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 
 from app.db.mongodb import get_db
-from app.models.schemas import KPISnapshot, KPISummary
-from app.services.kpi_service import get_latest_snapshot, list_snapshots
+from app.models.schemas import KPIGroup, KPISnapshot, KPISummary, LiveKPI
+from app.services.executor import run_io
+from app.services.ingest_service import live_store
+from app.services.kpi_service import (
+    compute_kpi_breakdown,
+    get_latest_snapshot,
+    list_rollups,
+    list_snapshots,
+)
 
 router = APIRouter(prefix="/kpis", tags=["kpis"])
 
@@ -20,3 +27,26 @@ async def kpi_snapshots(
     db=Depends(get_db),
 ) -> list[KPISnapshot]:
     return await list_snapshots(db, limit)
+
+
+@router.get("/breakdown", response_model=list[KPIGroup])
+async def kpi_breakdown(by: str = Query("unit", pattern="^(unit|hour|day)$")) -> list[KPIGroup]:
+    return await run_io(compute_kpi_breakdown, by)
+
+
+@router.get("/rollups", response_model=list[KPIGroup])
+async def kpi_rollups(
+    granularity: str = Query("day", pattern="^(unit|hour|day)$"),
+    limit: int = Query(100, ge=1, le=5000),
+    db=Depends(get_db),
+) -> list[KPIGroup]:
+    return await list_rollups(db, granularity, limit)
+
+
+@router.get("/live", response_model=list[LiveKPI])
+async def kpi_live(
+    unit: str | None = Query(None, description="Only this unit, e.g. VDU"),
+    window: int | None = Query(None, ge=1, description="Most recent readings per unit (default: all buffered)"),
+) -> list[LiveKPI]:
+    """KPIs over readings pushed through ``POST /ingest``."""
+    return await run_io(live_store.summaries, unit, window)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.config import settings
+from app.db import mongodb
+from app.routes.auth_routes import require_user
+from app.services.alert_hub import alert_hub
+from app.services.chat_log_writer import chat_log_stats
+from app.services.chatbot_service import response_cache
+from app.services.dataset_registry import registry
+from app.services.executor import executor_stats
+from app.services.forecast_engine import forecast_engine
+from app.services.ingest_service import live_store
+from app.services.kpi_service import get_aggregator
+from app.services.passwords import hashing_pool
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/datasets")
+async def dataset_metrics() -> dict[str, Any]:
+    return registry.stats()
+
+
+@router.get("/kpi-aggregator")
+async def kpi_aggregator_metrics() -> dict[str, Any]:
+    return get_aggregator().stats()
+
+
+# Shows which collections and query shapes are slow; restricted to signed-in users.
+@router.get("/mongo/slow-ops", dependencies=[Depends(require_user)])
+async def mongo_slow_operations() -> list[dict[str, Any]]:
+    if mongodb.slow_operations is None or mongodb.client is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow operation recording is disabled; set MONGO_SLOW_OP_MS to enable it.",
+        )
+    return await mongodb.slow_operations.report(mongodb.client)
+
+
+@router.get("/mongo/pool")
+async def mongo_pool_metrics() -> dict[str, Any]:
+    return mongodb.pool_metrics.snapshot(settings.mongo_max_pool_size)
+
+
+@router.get("/executors")
+async def executor_metrics() -> dict[str, Any]:
+    return executor_stats()
+
+
+@router.get("/password-hashing")
+async def password_hashing_metrics() -> dict[str, Any]:
+    return hashing_pool.stats()
+
+
+@router.get("/chatbot-cache")
+async def chatbot_cache_metrics() -> dict[str, Any]:
+    return response_cache.stats()
+
+
+@router.get("/chat-log")
+async def chat_log_metrics() -> dict[str, Any]:
+    return chat_log_stats()
+
+
+@router.get("/ingest")
+async def ingest_metrics() -> dict[str, Any]:
+    return live_store.stats()
+
+
+@router.get("/alerts")
+async def alert_metrics() -> dict[str, Any]:
+    return alert_hub.stats()
+
+
+@router.get("/forecast-engine")
+async def forecast_engine_metrics() -> dict[str, Any]:
+    return forecast_engine.stats()
@@ -0,0 +1,146 @@
+"""Push delivery of new anomaly alerts to subscribed dashboards.
+
+Producers (live ingestion and the anomaly dataset watcher) hand a batch of
+alerts to ``publish``, from the event loop or, via ``publish_threadsafe``,
+from a worker thread. Each alert is serialised once and the batch is grouped
+by ``(unit, severity)``; a subscriber then gets one JSON array holding just
+the groups its filters match, so the cost per client is a string join rather
+than a re-encode. Every subscriber has its own bounded queue: a slow
+dashboard never holds up the producer or the other clients, it loses its
+oldest undelivered message instead (counted in ``stats``).
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from app.config import settings
+from app.services.streaming import to_json
+
+# Returned by ``Subscription.next`` when nothing arrived within the heartbeat interval.
+KEEPALIVE = ""
+
+
+class TooManySubscribers(RuntimeError):
+    """The hub already has ``ALERT_MAX_SUBSCRIBERS`` subscribers."""
+
+
+def _filter(values: Iterable[str] | None) -> frozenset[str] | None:
+    values = frozenset(value.casefold() for value in values or () if value)
+    return values or None
+
+
+@dataclass(eq=False)
+class Subscription:
+    units: frozenset[str] | None
+    severities: frozenset[str] | None
+    queue: asyncio.Queue = field(repr=False)
+    dropped: int = 0
+
+    def matches(self, unit: str, severity: str) -> bool:
+        return (self.units is None or unit in self.units) and (
+            self.severities is None or severity in self.severities
+        )
+
+    async def next(self, timeout: float) -> str | None:
+        """The next JSON array of alerts, ``KEEPALIVE`` after ``timeout`` idle seconds, ``None`` once closed."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return KEEPALIVE
+
+
+class AlertHub:
+    def __init__(self, queue_size: int, max_subscribers: int) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, units: Iterable[str] | None = None, severities: Iterable[str] | None = None) -> Subscription:
+        """Register a subscriber; must be called on the event loop that will consume it."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers(f"At most {self.max_subscribers} alert subscribers")
+            self._loop = asyncio.get_running_loop()
+            subscription = Subscription(_filter(units), _filter(severities), asyncio.Queue(self.queue_size))
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @staticmethod
+    def _encode(alerts: list[dict[str, Any]]) -> dict[tuple[str, str], str]:
+        groups: dict[tuple[str, str], list[str]] = {}
+        for alert in alerts:
+            key = (str(alert.get("unit") or "").casefold(), str(alert.get("severity") or "").casefold())
+            groups.setdefault(key, []).append(to_json(alert))
+        return {key: ",".join(encoded) for key, encoded in groups.items()}
+
+    def _offer(self, subscription: Subscription, message: str | None) -> None:
+        try:
+            subscription.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            subscription.queue.get_nowait()
+            subscription.queue.put_nowait(message)
+            subscription.dropped += 1
+            self.dropped += 1
+
+    def _deliver(self, groups: dict[tuple[str, str], str], count: int) -> None:
+        self.published += count
+        everything = "[" + ",".join(groups.values()) + "]"
+        for subscription in list(self._subscribers):
+            if subscription.units is None and subscription.severities is None:
+                message = everything
+            else:
+                matched = [encoded for (unit, severity), encoded in groups.items() if subscription.matches(unit, severity)]
+                if not matched:
+                    continue
+                message = "[" + ",".join(matched) + "]"
+            self._offer(subscription, message)
+            self.delivered += 1
+
+    def publish(self, alerts: list[dict[str, Any]]) -> None:
+        """Broadcast ``alerts``; call on the event loop."""
+        if alerts and self._subscribers:
+            self._deliver(self._encode(alerts), len(alerts))
+
+    def publish_threadsafe(self, alerts: list[dict[str, Any]]) -> None:
+        """Broadcast ``alerts`` from a worker thread (encoding happens on the caller's thread)."""
+        loop = self._loop
+        if not alerts or not self._subscribers or loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._deliver, self._encode(alerts), len(alerts))
+
+    def close(self) -> None:
+        """End every subscription (their streams see ``None``)."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscription in subscribers:
+            self._offer(subscription, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "pending": sum(subscription.queue.qsize() for subscription in list(self._subscribers)),
+        }
+
+
+alert_hub = AlertHub(settings.alert_queue_size, settings.alert_max_subscribers)
@@ -0,0 +1,57 @@
+"""Background task that broadcasts anomalies appended to the anomaly dataset.
+
+While anyone is subscribed to the alert hub, the anomaly CSV (the source
+behind ``/anomalies``) is checked every ``ALERT_POLL_SECONDS``; the registry
+reloads it when the file changes, and alerts for the anomalous rows appended
+since the previous check are published. Without subscribers the baseline is
+dropped, so a dashboard that connects later is not flooded with old rows.
+Live ingestion publishes its own alerts directly.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.config import settings
+from app.services.alert_hub import alert_hub
+from app.services.anomaly_service import new_alerts
+from app.services.executor import run_io
+
+logger = logging.getLogger(__name__)
+
+_task: asyncio.Task | None = None
+
+
+async def run_alert_watcher(interval: float) -> None:
+    seen_rows: int | None = None
+    while True:
+        try:
+            if alert_hub.has_subscribers:
+                seen_rows, alerts = await run_io(new_alerts, seen_rows)
+                alert_hub.publish(alerts)
+            else:
+                seen_rows = None
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Anomaly alert check failed")
+        await asyncio.sleep(interval)
+
+
+def start_alert_watcher() -> None:
+    global _task
+    if settings.alert_poll_seconds <= 0 or _task is not None:
+        return
+    _task = asyncio.create_task(run_alert_watcher(settings.alert_poll_seconds))
+
+
+async def stop_alert_watcher() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,155 @@
+"""Per-unit / per-severity group index over the anomaly rows of a dataset.
+
+Built once per dataset version: every ``(unit, severity)`` combination, including
+the "any unit" and "any severity" wildcards, gets its own ``TimeIndex`` so a
+filtered, time-bounded page is still a binary search plus a slice. Per-unit
+counts and score statistics are aggregated at the same time.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.records import series_values
+from app.services.time_index import MISSING_KEY, TimeIndex, time_keys
+
+SEVERITY_THRESHOLDS = ((0.9, "critical"), (0.7, "high"), (0.5, "medium"))
+# Label for a missing unit or severity cell, so NaN is not indexed as the string "nan".
+UNKNOWN = "unknown"
+
+
+def score_severity(scores: np.ndarray | pd.Series) -> np.ndarray:
+    """Map anomaly scores to severity labels; missing scores count as 0."""
+    values = np.nan_to_num(np.asarray(scores, dtype="float64"), nan=0.0)
+    return np.select(
+        [values >= threshold for threshold, _ in SEVERITY_THRESHOLDS],
+        [label for _, label in SEVERITY_THRESHOLDS],
+        default="low",
+    )
+
+
+def severity_labels(
+    frame: pd.DataFrame, severity_col: str | None, score_col: str | None
+) -> np.ndarray:
+    """Severity per row: the dataset's own column if present, else derived from the score."""
+    if severity_col is not None:
+        return frame[severity_col].fillna(UNKNOWN).astype(str).str.lower().to_numpy()
+    if score_col is not None:
+        return score_severity(pd.to_numeric(frame[score_col], errors="coerce"))
+    return np.full(len(frame.index), "low", dtype=object)
+
+
+def _key(value: str | None) -> str | None:
+    # Units and severities match case-insensitively; rollups.load_history follows the same rule.
+    return None if value is None else value.casefold()
+
+
+class AnomalyIndex:
+    def __init__(self, groups: dict[tuple[str | None, str | None], TimeIndex], units: list[dict[str, Any]]):
+        self._groups = groups
+        self.units = units
+
+    def select(self, unit: str | None = None, severity: str | None = None) -> TimeIndex:
+        empty = TimeIndex(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        return self._groups.get((_key(unit), _key(severity)), empty)
+
+    @classmethod
+    def build(
+        cls,
+        frame: pd.DataFrame,
+        anomaly_col: str | None,
+        time_col: str | None,
+        unit_col: str | None,
+        severity_col: str | None,
+        score_col: str | None,
+    ) -> "AnomalyIndex":
+        if anomaly_col is not None:
+            is_anomaly = (frame[anomaly_col] == 1).to_numpy()
+        else:
+            is_anomaly = np.ones(len(frame.index), dtype=bool)
+        positions = np.flatnonzero(is_anomaly)
+
+        units = (
+            frame[unit_col].fillna(UNKNOWN).astype(str).to_numpy()
+            if unit_col is not None
+            else np.full(len(frame.index), "", dtype=object)
+        )
+        rows = pd.DataFrame(
+            {
+                "position": positions,
+                "key": time_keys(frame, time_col, positions),
+                "unit": units[positions],
+                "severity": severity_labels(frame.iloc[positions], severity_col, score_col),
+            }
+        )
+
+        groups = {(None, None): _group_index(rows)}
+        for severity, group in rows.groupby("severity", sort=False):
+            groups[(None, _key(severity))] = _group_index(group)
+        if unit_col is not None:
+            for unit, group in rows.groupby("unit", sort=False):
+                groups[(_key(unit), None)] = _group_index(group)
+            for (unit, severity), group in rows.groupby(["unit", "severity"], sort=False):
+                groups[(_key(unit), _key(severity))] = _group_index(group)
+
+        return cls(groups, _unit_summaries(frame, is_anomaly, units, rows, score_col, unit_col))
+
+
+def _group_index(rows: pd.DataFrame) -> TimeIndex:
+    return TimeIndex.from_keys(rows["key"].to_numpy(), rows["position"].to_numpy())
+
+
+def _unit_summaries(
+    frame: pd.DataFrame,
+    is_anomaly: np.ndarray,
+    units: np.ndarray,
+    rows: pd.DataFrame,
+    score_col: str | None,
+    unit_col: str | None,
+) -> list[dict[str, Any]]:
+    if unit_col is None:
+        return []
+
+    totals = pd.Series(units).value_counts()
+    anomalies = pd.DataFrame({"unit": units, "anomaly": is_anomaly}).groupby("unit")["anomaly"].sum()
+    severity_counts = rows.groupby(["unit", "severity"]).size()
+
+    score_stats = None
+    if score_col is not None:
+        scores = pd.to_numeric(frame[score_col].iloc[rows["position"]], errors="coerce").to_numpy()
+        score_stats = (
+            pd.DataFrame({"unit": rows["unit"].to_numpy(), "score": scores})
+            .groupby("unit")["score"]
+            .agg(["min", "mean", "max"])
+        )
+
+    timed = rows[rows["key"] != MISSING_KEY]
+    last_seen = timed.groupby("unit")["key"].max()
+
+    summaries = []
+    for unit in sorted(totals.index):
+        count = int(anomalies.get(unit, 0))
+        score_min = score_mean = score_max = None
+        if score_stats is not None and unit in score_stats.index:
+            score_min, score_mean, score_max = series_values(score_stats.loc[unit])
+        latest = last_seen.get(unit)
+        summaries.append(
+            {
+                "unit": unit,
+                "readings": int(totals[unit]),
+                "anomalies": count,
+                "anomaly_rate": count / int(totals[unit]),
+                "severity_counts": (
+                    {str(key): int(value) for key, value in severity_counts.loc[unit].items()}
+                    if count
+                    else {}
+                ),
+                "score_min": score_min,
+                "score_mean": score_mean,
+                "score_max": score_max,
+                "last_anomaly_at": None if latest is None else pd.Timestamp(int(latest)).to_pydatetime(),
+            }
+        )
+    return summaries
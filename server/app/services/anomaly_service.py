@@ -1,81 +1,192 @@
+"""Anomaly records, per-unit summaries and alerts from the anomaly dataset.
+
+Filtered and time-bounded pages, unit summaries and alerts are served from an
+``AnomalyIndex`` built once per dataset version; records are converted column
+by column only for the rows of the requested page.
+"""
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from pathlib import Path
+from datetime import datetime
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
-from app.config import settings
-
-
-def _resolve_path(file_name: str) -> Path:
-    return Path(settings.data_dir) / file_name
-
-
-def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    lowered = {col.lower(): col for col in df.columns}
-    for name in candidates:
-        if name.lower() in lowered:
-            return lowered[name.lower()]
-    return None
-
-
-def _safe_float(value) -> float | None:
-    try:
-        if pd.isna(value):
-            return None
-        return float(value)
-    except Exception:
-        return None
-
-
-def load_anomalies(limit: int) -> list[dict]:
-    file_path = _resolve_path("final_refinery_data_with_anomalies.csv")
-    if not file_path.exists():
+from app.services.anomaly_index import AnomalyIndex, severity_labels
+from app.services.dataset_registry import Dataset, get_dataset
+from app.services.records import column_values, float_values, frame_to_records, iter_frame_chunks
+
+ANOMALY_FILE = "final_refinery_data_with_anomalies.csv"
+ANOMALY_COLUMNS = ("anomaly", "is_anomaly", "anomaly_flag")
+SCORE_COLUMNS = ("score", "anomaly_score", "z_score")
+TIME_COLUMNS = ("timestamp", "time", "date")
+UNIT_COLUMNS = ("unit_name", "unit", "unit_id")
+SEVERITY_COLUMNS = ("severity",)
+# Field names of the columnar format.
+ANOMALY_COLUMNS_FORMAT = ("timestamps", "scores", "units", "severities")
+
+
+def _build_index(dataset: Dataset) -> AnomalyIndex:
+    return AnomalyIndex.build(
+        dataset.frame,
+        anomaly_col=dataset.column(*ANOMALY_COLUMNS),
+        time_col=dataset.column(*TIME_COLUMNS),
+        unit_col=dataset.column(*UNIT_COLUMNS),
+        severity_col=dataset.column(*SEVERITY_COLUMNS),
+        score_col=dataset.column(*SCORE_COLUMNS),
+    )
+
+
+def _to_records(dataset: Dataset, page: pd.DataFrame) -> list[dict]:
+    score_col = dataset.column(*SCORE_COLUMNS)
+    severities = severity_labels(page, dataset.column(*SEVERITY_COLUMNS), score_col)
+    return [
+        {"timestamp": timestamp, "score": score, "unit": unit, "severity": severity, "raw": raw}
+        for timestamp, score, unit, severity, raw in zip(
+            column_values(page, dataset.column(*TIME_COLUMNS)),
+            float_values(page, score_col),
+            column_values(page, dataset.column(*UNIT_COLUMNS)),
+            severities.tolist(),
+            frame_to_records(page),
+        )
+    ]
+
+
+def load_anomalies(
+    limit: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    unit: str | None = None,
+    severity: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """One page of anomalies ordered by time, plus the cursor of the next page."""
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return [], None
+
+    index = dataset.derived("anomaly_index", _build_index).select(unit, severity)
+    positions, next_cursor = index.page(start, end, cursor, limit)
+    return _to_records(dataset, dataset.frame.iloc[positions]), next_cursor
+
+
+def load_anomaly_columns(
+    limit: int | None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    unit: str | None = None,
+    severity: str | None = None,
+) -> tuple[dict[str, np.ndarray], str | None]:
+    """One page as parallel arrays (``timestamps``, ``scores``, ``units``, ``severities``) plus the next cursor."""
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return {name: np.empty(0) for name in ANOMALY_COLUMNS_FORMAT}, None
+
+    index = dataset.derived("anomaly_index", _build_index).select(unit, severity)
+    positions, next_cursor = index.page(start, end, cursor, limit)
+    page = dataset.frame.iloc[positions]
+    score_col = dataset.column(*SCORE_COLUMNS)
+    return {
+        "timestamps": np.array(column_values(page, dataset.column(*TIME_COLUMNS)), dtype=object),
+        "scores": np.array(float_values(page, score_col), dtype="float64"),
+        "units": np.array(column_values(page, dataset.column(*UNIT_COLUMNS)), dtype=object),
+        "severities": severity_labels(page, dataset.column(*SEVERITY_COLUMNS), score_col),
+    }, next_cursor
+
+
+def iter_anomalies(
+    limit: int | None = None,
+    chunk_size: int = 500,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    unit: str | None = None,
+    severity: str | None = None,
+) -> Iterator[list[dict]]:
+    """Yield anomaly records chunk by chunk; ``limit=None`` streams every match."""
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return
+
+    index = dataset.derived("anomaly_index", _build_index).select(unit, severity)
+    positions, _ = index.page(start, end, cursor, limit)
+    for chunk in iter_frame_chunks(dataset.frame, chunk_size, positions):
+        yield _to_records(dataset, chunk)
+
+
+def _rank_by_score(dataset: Dataset) -> np.ndarray:
+    # Anomaly positions by descending score (ties and missing scores: most recent first).
+    positions = dataset.derived("anomaly_index", _build_index).select().positions[::-1]
+    score_col = dataset.column(*SCORE_COLUMNS)
+    if score_col is None:
+        return positions
+    scores = pd.to_numeric(dataset.frame[score_col].iloc[positions], errors="coerce").to_numpy()
+    return positions[np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")]
+
+
+def load_top_anomalies(limit: int) -> list[dict]:
+    """The ``limit`` highest-scoring anomalies."""
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
         return []
+    positions = dataset.derived("anomalies_by_score", _rank_by_score)[:limit]
+    return _to_records(dataset, dataset.frame.iloc[positions])
 
-    df = pd.read_csv(file_path)
-    anomaly_col = _find_column(df, ["anomaly", "is_anomaly", "anomaly_flag"])
-    score_col = _find_column(df, ["score", "anomaly_score", "z_score"])
-    time_col = _find_column(df, ["timestamp", "time", "date"])
-
-    if anomaly_col:
-        df = df[df[anomaly_col] == 1]
-
-    records = []
-    for _, row in df.head(limit).iterrows():
-        records.append(
-            {
-                "timestamp": row.get(time_col) if time_col else None,
-                "score": _safe_float(row.get(score_col)) if score_col else None,
-                "raw": row.to_dict(),
-            }
-        )
 
-    return records
+def load_unit_summaries() -> list[dict]:
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return []
+    return dataset.derived("anomaly_index", _build_index).units
+
+
+def _alerts(dataset: Dataset, positions: np.ndarray) -> list[dict]:
+    """Alerts for the rows at ``positions``; rows whose time cell does not parse are skipped."""
+    page = dataset.frame.iloc[positions]
+    time_col = dataset.column(*TIME_COLUMNS)
+    if time_col is None:
+        times: list[datetime | None] = [None] * len(positions)
+    else:
+        # Few rows, each parsed on its own so one odd format does not decide the others.
+        parsed = pd.to_datetime(page[time_col], errors="coerce", format="mixed")
+        keep = parsed.notna().to_numpy()
+        positions, page = positions[keep], page[keep]
+        times = [stamp.to_pydatetime(warn=False) for stamp in parsed[keep]]
+    return [
+        {
+            "id": f"{ANOMALY_FILE}:{position}",
+            "message": f"Anomaly detected in {record['unit']}." if record["unit"] else "Anomaly detected in refinery operations.",
+            "severity": record["severity"],
+            "timestamp": timestamp,
+            "unit": record["unit"],
+            "score": record["score"],
+            "source": "anomaly_detection",
+        }
+        for position, timestamp, record in zip(positions.tolist(), times, _to_records(dataset, page))
+    ]
 
 
 def build_alerts(limit: int) -> list[dict]:
-    anomalies = load_anomalies(limit)
-    alerts = []
-    for record in anomalies:
-        score = record.get("score") or 0
-        if score >= 0.9:
-            severity = "critical"
-        elif score >= 0.7:
-            severity = "high"
-        elif score >= 0.5:
-            severity = "medium"
-        else:
-            severity = "low"
-
-        alerts.append(
-            {
-                "message": "Anomaly detected in refinery operations.",
-                "severity": severity,
-                "timestamp": datetime.now(timezone.utc),
-                "source": "anomaly_detection",
-            }
-        )
-
-    return alerts
+    """Alerts for the ``limit`` most recent anomalies, newest first, stamped with their own time."""
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return []
+    positions = dataset.derived("anomaly_index", _build_index).select().positions[::-1][:limit]
+    return _alerts(dataset, positions)
+
+
+def new_alerts(seen_rows: int | None) -> tuple[int | None, list[dict]]:
+    """Alerts for anomalies in rows appended since the file had ``seen_rows`` rows, plus its row count now.
+
+    The first call (``seen_rows`` is ``None``) and a file that shrank (rewritten)
+    only establish the baseline.
+    """
+    dataset = get_dataset(ANOMALY_FILE)
+    if dataset is None:
+        return None, []
+    rows = len(dataset.frame.index)
+    if seen_rows is None or rows <= seen_rows:
+        return rows, []
+    positions = dataset.derived("anomaly_index", _build_index).select().positions
+    return rows, _alerts(dataset, np.sort(positions[positions >= seen_rows]))
@@ -0,0 +1,156 @@
+"""Chatbot prompt context assembled on the server.
+
+Instead of interpolating whatever the client sends, the system prompt is built
+from the cached services: the KPI summary, the highest-scoring anomalies,
+per-unit anomaly statistics and the top recommendations. Sections are added
+line by line until ``CHATBOT_CONTEXT_TOKEN_BUDGET`` (estimated at four
+characters per token) is used up, so large alert lists cannot blow up the
+prompt. The assembled prefix is cached until one of the underlying datasets
+changes.
+"""
+from __future__ import annotations
+
+import json
+import math
+import threading
+from typing import Any, Hashable
+
+from app.config import settings
+from app.services.anomaly_service import ANOMALY_FILE, load_top_anomalies, load_unit_summaries
+from app.services.dataset_registry import get_dataset
+from app.services.kpi_service import compute_kpi_summary, get_aggregator
+from app.services.recommendation_service import RECOMMENDATION_FILE, load_recommendations
+
+INTRO = (
+    "You are a refinery operations assistant. Explain KPIs, alerts, forecasts, and "
+    "recommendations clearly for engineers and leadership."
+)
+OUTRO = "Keep responses concise, actionable, and data-driven."
+CHARS_PER_TOKEN = 4
+
+_lock = threading.Lock()
+_prefix: tuple[Hashable, str] | None = None
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _number(value: float | None, digits: int = 1) -> str:
+    return "n/a" if value is None else f"{value:,.{digits}f}"
+
+
+def _percent(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def _clip(text: str | None, length: int = 160) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= length else text[: length - 1] + "…"
+
+
+def _kpi_lines() -> list[str]:
+    kpis = compute_kpi_summary()
+    return [
+        f"total_energy={_number(kpis['total_energy'], 0)} avg_energy={_number(kpis['avg_energy'])} "
+        f"avg_sec={_number(kpis['avg_sec'], 2)} anomaly_rate={_percent(kpis['anomaly_rate'])}"
+    ]
+
+
+def _alert_lines(limit: int) -> list[str]:
+    return [
+        f"- {record['timestamp'] or 'unknown time'} {record['unit'] or 'plant'} "
+        f"{record['severity']} score={_number(record['score'], 2)}"
+        for record in load_top_anomalies(limit)
+    ]
+
+
+def _unit_lines(limit: int) -> list[str]:
+    units = sorted(load_unit_summaries(), key=lambda unit: unit["anomaly_rate"], reverse=True)
+    lines = []
+    for unit in units[:limit]:
+        severities = ", ".join(f"{name} {count}" for name, count in sorted(unit["severity_counts"].items()))
+        lines.append(
+            f"- {unit['unit']}: {unit['readings']} readings, {unit['anomalies']} anomalies "
+            f"({_percent(unit['anomaly_rate'])})" + (f"; {severities}" if severities else "")
+        )
+    return lines
+
+
+def _recommendation_lines(limit: int) -> list[str]:
+    lines = []
+    for item in load_recommendations(limit):
+        line = f"- {_clip(item['title'], 80)}"
+        if item["description"]:
+            line += f": {_clip(item['description'])}"
+        if item["impact"]:
+            line += f" (impact: {_clip(item['impact'], 60)})"
+        lines.append(line)
+    return lines
+
+
+def _fit(sections: list[tuple[str, list[str]]], budget: int) -> list[str]:
+    """Section headers and as many lines as fit in ``budget`` tokens, in section order."""
+    output: list[str] = []
+    used = 0
+    for title, lines in sections:
+        header = f"{title}:"
+        if not lines or used + estimate_tokens(header) + estimate_tokens(lines[0]) + 1 > budget:
+            continue
+        output.append(header)
+        used += estimate_tokens(header)
+        for index, line in enumerate(lines):
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                output.append(f"- … {len(lines) - index} more omitted")
+                break
+            output.append(line)
+            used += cost
+    return output
+
+
+def data_version() -> Hashable:
+    """Changes whenever the KPI, anomaly or recommendation data does."""
+    aggregator = get_aggregator()
+    aggregator.refresh()
+    versions: list[Any] = [aggregator.version]
+    for file_name in (ANOMALY_FILE, RECOMMENDATION_FILE):
+        dataset = get_dataset(file_name)
+        versions.append(None if dataset is None else dataset.version)
+    return tuple(versions)
+
+
+def build_prompt_prefix() -> str:
+    global _prefix
+    version = (data_version(), settings.chatbot_context_token_budget, settings.chatbot_context_top_n)
+    with _lock:
+        if _prefix is not None and _prefix[0] == version:
+            return _prefix[1]
+
+        top_n = settings.chatbot_context_top_n
+        budget = settings.chatbot_context_token_budget - estimate_tokens(INTRO) - estimate_tokens(OUTRO)
+        lines = _fit(
+            [
+                ("KPIs", _kpi_lines()),
+                ("Top alerts", _alert_lines(top_n)),
+                ("Units by anomaly rate", _unit_lines(top_n)),
+                ("Recommendations", _recommendation_lines(top_n)),
+            ],
+            budget,
+        )
+        prefix = "\n".join([INTRO, *lines])
+        _prefix = (version, prefix)
+        return prefix
+
+
+def build_system_prompt(context: dict[str, Any] | None = None) -> str:
+    """Server-assembled prompt; any client ``context`` is appended, clipped to the remaining budget."""
+    prefix = build_prompt_prefix()
+    parts = [prefix]
+    if context:
+        remaining = settings.chatbot_context_token_budget - estimate_tokens(prefix) - estimate_tokens(OUTRO)
+        extra = json.dumps(context, default=str, separators=(",", ":"))
+        if remaining > 0:
+            parts.append("Operator context: " + _clip(extra, remaining * CHARS_PER_TOKEN))
+    parts.append(OUTRO)
+    return "\n".join(parts)
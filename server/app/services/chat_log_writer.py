@@ -0,0 +1,148 @@
+"""Buffered writer for ``chatbot_logs``.
+
+Chat handlers enqueue log documents instead of awaiting an ``insert_one`` per
+reply. A background task collects them into batches of up to
+``CHAT_LOG_BATCH_SIZE`` documents (or whatever arrived within
+``CHAT_LOG_FLUSH_INTERVAL_SECONDS``) and writes each batch with one
+``insert_many``. The buffer holds at most ``CHAT_LOG_BUFFER_SIZE`` documents;
+when it is full, callers wait up to ``CHAT_LOG_PUT_TIMEOUT_SECONDS`` for room
+and the document is dropped (and counted) after that. Everything still
+buffered is written when the writer is stopped at shutdown.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ChatLogWriter:
+    def __init__(self, db, batch_size: int, flush_interval: float, buffer_size: int, put_timeout: float) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=buffer_size)
+        self._batch: list[dict[str, Any]] = []
+        self._task: asyncio.Task | None = None
+        self._inflight: asyncio.Future | None = None
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    async def submit(self, document: dict[str, Any]) -> bool:
+        """Buffer ``document``; returns ``False`` if it was dropped because the buffer stayed full."""
+        try:
+            self._queue.put_nowait(document)
+            return True
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self._queue.put(document), self.put_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight is not None:
+            await asyncio.gather(self._inflight, return_exceptions=True)
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        for start in range(0, len(self._batch), self.batch_size):
+            await self._write(self._batch[start : start + self.batch_size])
+        self._batch = []
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "buffered": self._queue.qsize() + len(self._batch),
+            "capacity": self._queue.maxsize,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shielded so a shutdown arriving mid-write does not lose the batch; stop() awaits it.
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            await self.db.chatbot_logs.insert_many(batch, ordered=False)
+            self.flushed += len(batch)
+        except Exception:
+            # Not just PyMongoError: bson's InvalidDocument, say, would otherwise end the task and strand the queue.
+            self.failed += len(batch)
+            logger.exception("Failed to write %d chat log documents", len(batch))
+        self.batches += 1
+
+
+_writer: ChatLogWriter | None = None
+
+
+async def log_chat(document: dict[str, Any]) -> bool:
+    """Queue a chat log document; a no-op when Mongo is not configured."""
+    if _writer is None:
+        return False
+    return await _writer.submit(document)
+
+
+def chat_log_stats() -> dict[str, Any]:
+    if _writer is None:
+        return {"running": False}
+    return _writer.stats()
+
+
+def start_chat_log_writer(db) -> None:
+    global _writer
+    if db is None or _writer is not None:
+        return
+    _writer = ChatLogWriter(
+        db,
+        batch_size=settings.chat_log_batch_size,
+        flush_interval=settings.chat_log_flush_interval_seconds,
+        buffer_size=settings.chat_log_buffer_size,
+        put_timeout=settings.chat_log_put_timeout_seconds,
+    )
+    _writer.start()
+
+
+async def stop_chat_log_writer() -> None:
+    global _writer
+    if _writer is None:
+        return
+    await _writer.stop()
+    _writer = None
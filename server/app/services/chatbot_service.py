@@ -1,41 +1,60 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
-
-import google.generativeai as genai
+from typing import Any, AsyncIterator
 
 from app.config import settings
+from app.services.chat_context import build_system_prompt
+from app.services.executor import run_io
+from app.services.llm_client import get_llm_client
+from app.services.response_cache import CachedReply, ResponseCache
+
+response_cache = ResponseCache(
+    max_entries=settings.chatbot_cache_max_entries,
+    ttl=settings.chatbot_cache_ttl_seconds,
+    similarity=settings.chatbot_cache_similarity,
+)
+
+
+async def system_prompt(context: dict[str, Any] | None) -> str:
+    # Assembling (or revalidating) the server-side context reads datasets; keep it off the loop.
+    return await run_io(build_system_prompt, context)
+
+
+def cached_reply(message: str, prompt: str) -> CachedReply | None:
+    if not settings.chatbot_cache_enabled:
+        return None
+    # Keyed on the system prompt, i.e. exactly the context the model would see.
+    return response_cache.get(message, prompt)
+
+
+def _remember(message: str, prompt: str, reply: str, model_name: str | None) -> None:
+    # Placeholder replies (no model configured) are not worth caching.
+    if settings.chatbot_cache_enabled and model_name is not None:
+        response_cache.put(message, prompt, reply, model_name)
+
+
+async def generate_reply(message: str, context: dict[str, Any] | None) -> tuple[str, str | None, bool]:
+    """Reply, model name and whether the reply came from the response cache."""
+    prompt = await system_prompt(context)
+    hit = cached_reply(message, prompt)
+    if hit is not None:
+        return hit.reply, hit.model, True
+
+    client = get_llm_client()
+    reply = await client.generate([prompt, message])
+    _remember(message, prompt, reply, client.model_name)
+    return reply, client.model_name, False
 
 
-def _build_system_prompt(context: dict[str, Any] | None) -> str:
-    context = context or {}
-    kpis = context.get("kpis") or {}
-    alerts = context.get("alerts") or []
-    recommendations = context.get("recommendations") or []
-
-    return (
-        "You are a refinery operations assistant. Explain KPIs, alerts, forecasts, and "
-        "recommendations clearly for engineers and leadership."
-        f"\nKPIs: {kpis}"
-        f"\nAlerts: {alerts}"
-        f"\nRecommendations: {recommendations}"
-        "\nKeep responses concise, actionable, and data-driven."
-    )
-
-
-def generate_reply(message: str, context: dict[str, Any] | None) -> tuple[str, str | None]:
-    if not settings.gemini_api_key:
-        return (
-            "Gemini API key is not configured. Set GEMINI_API_KEY in the server .env file.",
-            None,
-        )
-
-    genai.configure(api_key=settings.gemini_api_key)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    system_prompt = _build_system_prompt(context)
-    response = model.generate_content([system_prompt, message])
-    return response.text, model.model_name
+async def stream_reply(message: str, prompt: str) -> AsyncIterator[str]:
+    """Stream a fresh reply (callers check ``cached_reply`` first); cached once complete."""
+    client = get_llm_client()
+    parts = []
+    async for text in client.stream([prompt, message]):
+        parts.append(text)
+        yield text
+    _remember(message, prompt, "".join(parts), client.model_name)
 
 
 def build_chat_log(message: str, response: str, context: dict[str, Any] | None, user_id: str | None) -> dict:
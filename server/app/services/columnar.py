@@ -0,0 +1,73 @@
+"""Struct-of-arrays responses for the time-series endpoints.
+
+``format=columnar`` returns one JSON object with an array per field
+(``{"timestamps": [...], "values": [...], ...}``) instead of one object per
+point, so keys are not repeated per row and no ``raw`` copy of the source row
+is sent. ``format=arrow`` returns the same columns as an Arrow IPC stream
+(``application/vnd.apache.arrow.stream``) for clients that read Arrow
+directly; it needs pyarrow.
+
+Services hand over NumPy arrays, which are encoded as they are (see
+``json_codec``), with NaN mapped to ``null`` in both encodings.
+"""
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+import numpy as np
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+
+from app.services.json_codec import FastJSONResponse
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+FORMAT_PATTERN = "^(records|columnar|arrow)$"
+FORMAT_DESCRIPTION = "records (one object per point), columnar (an array per field) or arrow (Arrow IPC stream)"
+COLUMNAR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "content": {ARROW_MEDIA_TYPE: {}},
+        "description": "With format=columnar an object of parallel arrays; with format=arrow an Arrow IPC stream.",
+    }
+}
+
+
+def records_to_columns(records: list[dict[str, Any]], fields: Mapping[str, str]) -> dict[str, np.ndarray]:
+    """Columns named like ``fields``' keys, taken from each record's ``fields[key]`` entry."""
+    columns = {}
+    for name, key in fields.items():
+        values = [record.get(key) for record in records]
+        try:
+            columns[name] = np.array(values, dtype="float64")
+        except (TypeError, ValueError):
+            columns[name] = np.array(values, dtype=object)
+    return columns
+
+
+def _arrow_payload(columns: Mapping[str, np.ndarray], metadata: Mapping[str, Any]) -> bytes:
+    table = pa.table(
+        {name: pa.array(values, from_pandas=True) for name, values in columns.items()},
+        metadata={key: str(value) for key, value in metadata.items() if value is not None},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def columnar_response(
+    columns: Mapping[str, np.ndarray],
+    response_format: str,
+    metadata: Mapping[str, Any] | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    metadata = metadata or {}
+    if response_format == "arrow":
+        if pa is None:
+            raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail="pyarrow is not installed")
+        return Response(_arrow_payload(columns, metadata), media_type=ARROW_MEDIA_TYPE, headers=headers)
+    return FastJSONResponse({**metadata, **columns}, headers=headers)
@@ -0,0 +1,120 @@
+"""Arrow IPC sidecars for the CSV files in ``data_dir``.
+
+A sidecar is written once from its CSV into ``<data_dir>/.columnar/<stem>.arrow``
+(uncompressed, so it can be memory-mapped) and records the source file's mtime
+and size in its schema metadata. It is rebuilt whenever the CSV changes.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_DIR = ".columnar"
+SIDECAR_SUFFIX = ".arrow"
+_MTIME_KEY = b"refineryiq.source_mtime_ns"
+_SIZE_KEY = b"refineryiq.source_size"
+
+
+def is_available() -> bool:
+    return pa is not None
+
+
+def sidecar_path(csv_path: Path) -> Path:
+    return csv_path.parent / SIDECAR_DIR / f"{csv_path.stem}{SIDECAR_SUFFIX}"
+
+
+def _source_version(csv_path: Path) -> tuple[int, int]:
+    stat = csv_path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _open_schema(path: Path) -> "pa.Schema":
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).schema
+
+
+def is_fresh(csv_path: Path) -> bool:
+    target = sidecar_path(csv_path)
+    if not is_available() or not target.exists():
+        return False
+    try:
+        metadata = _open_schema(target).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    mtime_ns, size = _source_version(csv_path)
+    return metadata.get(_MTIME_KEY) == str(mtime_ns).encode() and metadata.get(
+        _SIZE_KEY
+    ) == str(size).encode()
+
+
+def convert(csv_path: Path) -> Path:
+    """Write (or overwrite) the Arrow sidecar for ``csv_path``."""
+    if not is_available():
+        raise RuntimeError("pyarrow is required to build columnar sidecars")
+
+    mtime_ns, size = _source_version(csv_path)
+    # Parse with pandas so the sidecar carries exactly the dtypes the CSV path would produce.
+    table = pa.Table.from_pandas(pd.read_csv(csv_path), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_MTIME_KEY] = str(mtime_ns).encode()
+    metadata[_SIZE_KEY] = str(size).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    target = sidecar_path(csv_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    feather.write_feather(table, str(tmp_path), compression="uncompressed")
+    os.replace(tmp_path, target)
+    return target
+
+
+def ensure_sidecar(csv_path: Path) -> Path | None:
+    """Return an up-to-date sidecar for ``csv_path``, or ``None`` if one cannot be used."""
+    if not is_available():
+        return None
+    if is_fresh(csv_path):
+        return sidecar_path(csv_path)
+    try:
+        return convert(csv_path)
+    except (OSError, ValueError, pa.ArrowException) as exc:
+        # Unwritable directory, or columns Arrow cannot type (e.g. mixed objects): use the CSV.
+        logger.warning("Could not write columnar sidecar for %s: %s", csv_path, exc)
+        return None
+
+
+def read_columns(path: Path) -> list[str]:
+    return list(_open_schema(path).names)
+
+
+def read_frame(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    table = feather.read_table(
+        str(path),
+        columns=list(columns) if columns is not None else None,
+        memory_map=True,
+    )
+    return table.to_pandas()
+
+
+def convert_directory(data_dir: Path, force: bool = False) -> list[tuple[Path, bool]]:
+    """Build sidecars for every CSV in ``data_dir``; returns ``(csv, converted)`` pairs."""
+    results = []
+    for csv_path in sorted(data_dir.glob("*.csv")):
+        if not force and is_fresh(csv_path):
+            results.append((csv_path, False))
+            continue
+        convert(csv_path)
+        results.append((csv_path, True))
+    return results
@@ -0,0 +1,245 @@
+"""Shared in-memory registry of the CSV datasets under ``settings.data_dir``.
+
+Each file is parsed once and kept together with its resolved column mapping.
+Entries are invalidated when the file's mtime or size changes and evicted in
+least-recently-used order once the configured memory budget is exceeded.
+
+When pyarrow is installed the CSV is read through its Arrow IPC sidecar (see
+``columnar_store``) and callers may ask for only the column groups they need.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import pandas as pd
+
+from app.config import settings
+from app.services import columnar_store
+
+# A column request is a list of candidate groups; each group resolves to one column.
+ColumnGroups = Sequence[Sequence[str]]
+
+
+def find_column(columns: Iterable[str], candidates: Iterable[str]) -> str | None:
+    lowered = {str(col).lower(): col for col in columns}
+    for name in candidates:
+        if name.lower() in lowered:
+            return lowered[name.lower()]
+    return None
+
+
+def _read_header(path: Path, sidecar: Path | None) -> tuple[str, ...]:
+    if sidecar is not None:
+        return tuple(columnar_store.read_columns(sidecar))
+    return tuple(pd.read_csv(path, nrows=0).columns)
+
+
+def _read_frame(path: Path, sidecar: Path | None, usecols: list[str] | None) -> pd.DataFrame:
+    if sidecar is not None:
+        return columnar_store.read_frame(sidecar, usecols)
+    return pd.read_csv(path, usecols=usecols)
+
+
+@dataclass
+class Dataset:
+    name: str
+    path: Path
+    frame: pd.DataFrame
+    schema: tuple[str, ...]
+    mtime_ns: int
+    size: int
+    nbytes: int
+    loaded: frozenset[str] | None = None
+    source: str = "csv"
+    hits: int = 0
+    _columns: dict[tuple[str, ...], str | None] = field(default_factory=dict, repr=False)
+    _derived: dict[str, Any] = field(default_factory=dict, repr=False)
+    # Datasets are shared by the I/O pool threads: one build lock per derived key.
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _building: dict[str, threading.Lock] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def version(self) -> tuple[int, int]:
+        return self.mtime_ns, self.size
+
+    def column(self, *candidates: str) -> str | None:
+        """Resolve the first matching column name, memoised per candidate list."""
+        key = tuple(candidates)
+        if key not in self._columns:
+            self._columns[key] = find_column(self.schema, key)
+        return self._columns[key]
+
+    def covers(self, columns: ColumnGroups | None) -> bool:
+        """Whether the loaded frame contains every column ``columns`` resolves to."""
+        if self.loaded is None:
+            return True
+        if columns is None:
+            return False
+        for group in columns:
+            name = self.column(*group)
+            if name is not None and name not in self.loaded:
+                return False
+        return True
+
+    def derived(self, key: str, factory: Callable[["Dataset"], Any]) -> Any:
+        """Return a structure computed from this dataset version, building it once.
+
+        Concurrent callers of the same ``key`` wait for the first build instead of
+        repeating it; different keys are built in parallel.
+        """
+        if key in self._derived:
+            return self._derived[key]
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            if key not in self._derived:
+                self._derived[key] = factory(self)
+        return self._derived[key]
+
+
+class DatasetRegistry:
+    def __init__(self, max_bytes: int, use_sidecars: bool = True) -> None:
+        self.max_bytes = max_bytes
+        self.use_sidecars = use_sidecars
+        self._entries: OrderedDict[Path, Dataset] = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: dict[Path, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._widenings = 0
+        self._evictions = 0
+
+    def get(self, path: Path, columns: ColumnGroups | None = None) -> Dataset | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._lookup(path, version, columns)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(path, threading.Lock())
+
+        with load_lock:
+            # Another thread may have parsed the same version while we waited.
+            cached = self._lookup(path, version, columns)
+            if cached is not None:
+                return cached
+
+            with self._lock:
+                previous = self._entries.get(path)
+            sidecar = columnar_store.ensure_sidecar(path) if self.use_sidecars else None
+            schema = _read_header(path, sidecar)
+
+            loaded = None
+            if columns is not None:
+                wanted = {find_column(schema, group) for group in columns} - {None}
+                if previous is not None and previous.version == version:
+                    # Widen a partially loaded frame instead of dropping columns other callers use.
+                    wanted |= previous.loaded or set(schema)
+                loaded = frozenset(wanted)
+
+            usecols = None if loaded is None else [name for name in schema if name in loaded]
+            frame = _read_frame(path, sidecar, usecols)
+            dataset = Dataset(
+                name=path.name,
+                path=path,
+                frame=frame,
+                schema=schema,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                nbytes=int(frame.memory_usage(deep=True).sum()),
+                loaded=loaded,
+                source="arrow" if sidecar is not None else "csv",
+            )
+
+            with self._lock:
+                current = self._entries.pop(path, None)
+                if current is None:
+                    self._misses += 1
+                elif current.version == version:
+                    # Same file, more columns: not a file change.
+                    self._widenings += 1
+                else:
+                    self._reloads += 1
+                self._entries[path] = dataset
+                self._evict()
+
+        return dataset
+
+    def invalidate(self, path: Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "reloads": self._reloads,
+                "widenings": self._widenings,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "datasets": [
+                    {
+                        "name": item.name,
+                        "rows": len(item.frame.index),
+                        "columns": len(item.frame.columns),
+                        "source": item.source,
+                        "bytes": item.nbytes,
+                        "hits": item.hits,
+                        "mtime_ns": item.mtime_ns,
+                    }
+                    for item in self._entries.values()
+                ],
+            }
+
+    def _lookup(
+        self, path: Path, version: tuple[int, int], columns: ColumnGroups | None
+    ) -> Dataset | None:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.version != version or not entry.covers(columns):
+                return None
+            self._entries.move_to_end(path)
+            self._hits += 1
+            entry.hits += 1
+            return entry
+
+    def _total_bytes(self) -> int:
+        return sum(item.nbytes for item in self._entries.values())
+
+    def _evict(self) -> None:
+        # The most recently loaded entry is always kept, even if it alone exceeds the budget.
+        while len(self._entries) > 1 and self._total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+registry = DatasetRegistry(
+    max_bytes=settings.dataset_cache_max_mb * 1024 * 1024,
+    use_sidecars=settings.columnar_sidecars,
+)
+
+
+def resolve_path(file_name: str) -> Path:
+    return Path(settings.data_dir) / file_name
+
+
+def get_dataset(file_name: str, columns: ColumnGroups | None = None) -> Dataset | None:
+    """Load ``file_name`` from the registry; ``columns`` limits which column groups are read."""
+    return registry.get(resolve_path(file_name), columns)
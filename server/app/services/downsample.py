@@ -0,0 +1,105 @@
+"""Chart-sized views of long series.
+
+``lttb`` is Largest-Triangle-Three-Buckets: it keeps the first and last point
+and, from each of ``threshold - 2`` equal buckets in between, the point that
+forms the largest triangle with the previously kept point and the average of
+the next bucket. Peaks and troughs survive, unlike with plain striding or
+averaging, so a few hundred points draw like the full series.
+
+``resample_records`` rolls a daily record series (the forecast endpoint's
+shape) up to weeks or months before it is thinned.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.records import frame_to_records
+
+# Period frequency of each calendar resolution; periods are labelled by their first day.
+RESOLUTION_FREQ = {"day": "D", "week": "W", "month": "M"}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Positions of the ``threshold`` points to keep (all of them if there are not more than that)."""
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        following = slice(stop, edges[bucket + 2] if bucket + 2 < len(edges) else count)
+        mean_x, mean_y = x[following].mean(), y[following].mean()
+        # Twice the triangle area; the constant factor does not change the argmax.
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (mean_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def lttb_records(records: list[dict[str, Any]], max_points: int, value: str = "value") -> list[dict[str, Any]]:
+    """Thin time-ordered records to at most ``max_points``; records without a value or time are dropped first."""
+    if len(records) <= max_points:
+        return records
+    times = pd.to_datetime([record.get("timestamp") for record in records], errors="coerce")
+    values = np.array([record.get(value) for record in records], dtype="float64")
+    usable = np.flatnonzero(~times.isna() & ~np.isnan(values))
+    positions = lttb(times.asi8[usable], values[usable], max_points)
+    return [records[index] for index in usable[positions]]
+
+
+def resample_records(records: list[dict[str, Any]], resolution: str, how: str) -> list[dict[str, Any]]:
+    """Aggregate ``timestamp``/``value`` records per calendar period (``how`` is ``sum`` or ``mean``).
+
+    ``lower``/``upper`` bounds, when present, are combined the same way as the values.
+    A period has no single source row, so ``raw`` is ``None``; the period and the
+    daily ``min``/``max``/``count`` are under ``rollup``.
+    """
+    if not records:
+        return []
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime([record.get("timestamp") for record in records], errors="coerce"),
+            **{
+                name: pd.to_numeric(pd.Series([record.get(name) for record in records]), errors="coerce")
+                for name in ("value", "lower", "upper")
+            },
+        }
+    ).dropna(subset=["timestamp"])
+    period = frame["timestamp"].dt.to_period(RESOLUTION_FREQ[resolution]).dt.start_time
+    grouped = frame.groupby(period)
+    bounded = grouped[["value", "lower", "upper"]]
+    # min_count keeps an all-missing period missing instead of summing to zero.
+    totals = bounded.sum(min_count=1) if how == "sum" else bounded.mean()
+    summary = pd.concat([totals, grouped["value"].agg(["min", "max", "count"])], axis=1)
+    summary.insert(0, "timestamp", summary.index.strftime("%Y-%m-%d"))
+    metric = records[0].get("metric")
+    return [
+        {
+            "timestamp": row["timestamp"],
+            "value": row["value"],
+            "lower": row["lower"],
+            "upper": row["upper"],
+            "metric": metric,
+            "raw": None,
+            "rollup": {
+                "period_start": row["timestamp"],
+                "resolution": resolution,
+                "min": row["min"],
+                "max": row["max"],
+                "count": row["count"],
+            },
+        }
+        for row in frame_to_records(summary)
+    ]
@@ -0,0 +1,100 @@
+"""Worker pools for blocking service calls made from async route handlers.
+
+``run_io`` hands file reads and pandas work to a shared thread pool so the
+event loop keeps serving other requests; ``run_cpu`` uses an optional process
+pool for picklable, CPU-bound functions and falls back to the thread pool when
+``CPU_WORKERS`` is 0. Functions that read state held by this process (the KPI
+aggregator, the ingest buffers) must use ``run_io``, since a worker process
+would only see its own copy. Setting ``IO_WORKERS`` to 0 runs calls inline on the
+event loop, which is only useful for comparing against the old behaviour.
+
+Both wrappers count the calls each pool has not finished yet; pools run their
+work first in, first out, so that count splits into active and queued calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+_io_pool: ThreadPoolExecutor | None = None
+_cpu_pool: ProcessPoolExecutor | None = None
+# Calls submitted to each pool and not finished yet; decremented from the worker side.
+_unfinished = {"io": 0, "cpu": 0}
+_unfinished_lock = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=settings.io_workers, thread_name_prefix="refineryiq-io")
+    return _io_pool
+
+
+def cpu_executor() -> Executor:
+    global _cpu_pool
+    if settings.cpu_workers <= 0:
+        return io_executor()
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=settings.cpu_workers)
+    return _cpu_pool
+
+
+def _finished(pool: str) -> None:
+    with _unfinished_lock:
+        _unfinished[pool] -= 1
+
+
+async def _submit(pool: str, executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    future = executor.submit(functools.partial(func, *args, **kwargs))
+    with _unfinished_lock:
+        _unfinished[pool] += 1
+    # Counted until the call itself finishes, even if the awaiting request is cancelled first.
+    future.add_done_callback(lambda _: _finished(pool))
+    return await asyncio.wrap_future(future)
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    if settings.io_workers <= 0:
+        return func(*args, **kwargs)
+    return await _submit("io", io_executor(), func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    if settings.io_workers <= 0 and settings.cpu_workers <= 0:
+        return func(*args, **kwargs)
+    # Without a process pool, CPU calls share (and are counted against) the I/O pool.
+    pool = "cpu" if settings.cpu_workers > 0 else "io"
+    return await _submit(pool, cpu_executor(), func, *args, **kwargs)
+
+
+def _load(pool: str, workers: int) -> dict[str, int]:
+    with _unfinished_lock:
+        unfinished = _unfinished[pool]
+    workers = max(workers, 0)
+    return {f"{pool}_active": min(unfinished, workers), f"{pool}_queued": max(0, unfinished - workers)}
+
+
+def executor_stats() -> dict[str, Any]:
+    return {
+        "io_workers": settings.io_workers,
+        **_load("io", settings.io_workers),
+        "cpu_workers": settings.cpu_workers,
+        **_load("cpu", settings.cpu_workers),
+    }
+
+
+def shutdown_executors() -> None:
+    global _io_pool, _cpu_pool
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _io_pool = None
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
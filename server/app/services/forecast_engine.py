@@ -0,0 +1,133 @@
+"""On-demand forecasts from the persisted forecast models.
+
+``python -m app.cli train`` stores one model per ``<metric>:<unit>`` (unit
+``all`` for the whole plant). The engine predicts any horizon from the current
+version and memoises the resulting records per ``(version, metric, unit,
+horizon)`` in a bounded LRU. Predictions do not depend on the horizon beyond
+its length, so a shorter horizon is served by slicing a longer cached one.
+Training a new version changes the key, so stale forecasts are never served
+and simply age out of the cache.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from app.config import settings
+from app.services import model_store
+from app.services.forecast_models import MODEL_KIND, PLANT, future_dates
+from app.services.records import frame_to_records
+
+SeriesKey = tuple[str, str, str]
+CacheKey = tuple[str, str, str, int]
+
+
+class UnknownSeries(LookupError):
+    """No model was trained for the requested metric and unit."""
+
+
+class ForecastEngine:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, list[dict[str, Any]]] = OrderedDict()
+        # Cached horizons per (version, metric, unit), so a miss finds a longer one to slice without a full scan.
+        self._horizons: dict[SeriesKey, set[int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.sliced_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _cached(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        with self._lock:
+            records = self._entries.get(key)
+            if records is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return records
+            series, horizon = key[:3], key[3]
+            longer = min((other for other in self._horizons.get(series, ()) if other > horizon), default=None)
+            if longer is None:
+                return None
+            source = (*series, longer)
+            self._entries.move_to_end(source)
+            self.sliced_hits += 1
+            return self._entries[source][:horizon]
+
+    def _store(self, key: CacheKey, records: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = records
+            self._entries.move_to_end(key)
+            self._horizons.setdefault(key[:3], set()).add(key[3])
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                horizons = self._horizons[evicted[:3]]
+                horizons.discard(evicted[3])
+                if not horizons:
+                    del self._horizons[evicted[:3]]
+                self.evictions += 1
+
+    def forecast(self, metric: str, horizon: int, unit: str = PLANT) -> tuple[str, list[dict[str, Any]]] | None:
+        """``(model version, records)`` for the next ``horizon`` days; ``None`` if nothing is trained."""
+        loaded = model_store.load_artifacts(MODEL_KIND)
+        if loaded is None:
+            return None
+        manifest, artifacts = loaded
+        model = artifacts.get(f"{metric}:{unit}")
+        if model is None:
+            raise UnknownSeries(f"No {metric} forecast model for unit {unit!r}")
+
+        key = (manifest["version"], metric, unit, horizon)
+        records = self._cached(key)
+        if records is None:
+            with self._lock:
+                self.misses += 1
+            predicted = model.predict(future_dates(model, horizon))
+            raw = frame_to_records(predicted.assign(ds=predicted["ds"].dt.strftime("%Y-%m-%d"), unit=unit))
+            records = [
+                {
+                    "timestamp": point["ds"],
+                    "value": point["yhat"],
+                    "lower": point["yhat_lower"],
+                    "upper": point["yhat_upper"],
+                    "metric": metric,
+                    "raw": point,
+                    "rollup": None,
+                }
+                for point in raw
+            ]
+            self._store(key, records)
+        return manifest["version"], records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._horizons.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits, sliced_hits, misses = self.hits, self.sliced_hits, self.misses
+            entries, evictions = len(self._entries), self.evictions
+        lookups = hits + sliced_hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "sliced_hits": sliced_hits,
+            "misses": misses,
+            "hit_rate": (hits + sliced_hits) / lookups if lookups else 0.0,
+            "evictions": evictions,
+        }
+
+
+def model_info() -> dict[str, Any] | None:
+    """Manifest of the current forecast models (version, backend, metrics, units)."""
+    loaded = model_store.load_artifacts(MODEL_KIND)
+    if loaded is None:
+        return None
+    manifest, _ = loaded
+    return {key: manifest.get(key) for key in ("version", "trained_at", "backend", "metrics", "units")}
+
+
+forecast_engine = ForecastEngine(settings.forecast_cache_max_entries)
@@ -0,0 +1,122 @@
+"""Daily forecast models: Prophet when installed, otherwise a NumPy fallback.
+
+Both expose the same small interface used by training and the forecast
+engine: ``fit(history)`` on a frame with ``ds``/``y`` columns and
+``predict(dates)`` returning ``ds, yhat, yhat_lower, yhat_upper`` (the shape
+of the forecast CSVs the notebook used to produce).
+
+The fallback, ``SeasonalTrendModel``, is a least-squares fit of a linear
+trend plus weekly and yearly Fourier terms, the same additive structure as
+Prophet's defaults without changepoints; its interval is the 80% band of the
+residuals, matching Prophet's default ``interval_width``.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    from prophet import Prophet
+except ImportError:  # pragma: no cover - optional dependency
+    Prophet = None
+
+MODEL_KIND = "forecast"
+# Artifact names are "<metric>:<unit>", with this unit for the whole plant.
+PLANT = "all"
+# z-score of the two-sided 80% interval.
+INTERVAL_Z = 1.2815515655446004
+WEEKLY_ORDER = 3
+YEARLY_ORDER = 5
+DAY_NS = 86_400 * 10**9
+
+
+def _fourier(days: np.ndarray, period: float, order: int) -> list[np.ndarray]:
+    terms = []
+    for k in range(1, order + 1):
+        angle = 2 * np.pi * k * days / period
+        terms.extend([np.sin(angle), np.cos(angle)])
+    return terms
+
+
+class SeasonalTrendModel:
+    backend = "fallback"
+
+    def __init__(self, yearly: bool | None = None, weekly: bool = True) -> None:
+        self.yearly = yearly
+        self.weekly = weekly
+        self.origin: int | None = None
+        self.coefficients: np.ndarray | None = None
+        self.sigma = 0.0
+        self.last_date: pd.Timestamp | None = None
+
+    def _design(self, dates: pd.Series | pd.DatetimeIndex) -> np.ndarray:
+        values = pd.DatetimeIndex(dates).asi8
+        days = (values - self.origin) / DAY_NS
+        columns = [np.ones_like(days), days]
+        if self.weekly:
+            columns += _fourier(days, 7.0, WEEKLY_ORDER)
+        if self.yearly:
+            columns += _fourier(days, 365.25, YEARLY_ORDER)
+        return np.column_stack(columns)
+
+    def fit(self, history: pd.DataFrame) -> "SeasonalTrendModel":
+        history = history.dropna(subset=["ds", "y"]).sort_values("ds")
+        dates = pd.to_datetime(history["ds"])
+        self.origin = int(dates.iloc[0].value)
+        self.last_date = dates.iloc[-1]
+        if self.yearly is None:
+            # Like Prophet: only fit yearly seasonality with at least two years of data.
+            self.yearly = (self.last_date - dates.iloc[0]).days >= 730
+        design = self._design(dates)
+        target = history["y"].to_numpy(dtype="float64")
+        self.coefficients, *_ = np.linalg.lstsq(design, target, rcond=None)
+        residuals = target - design @ self.coefficients
+        dof = max(1, len(target) - design.shape[1])
+        self.sigma = float(np.sqrt(residuals @ residuals / dof))
+        return self
+
+    def predict(self, dates: pd.Series | pd.DatetimeIndex) -> pd.DataFrame:
+        dates = pd.DatetimeIndex(dates)
+        yhat = self._design(dates) @ self.coefficients
+        band = INTERVAL_Z * self.sigma
+        return pd.DataFrame({"ds": dates, "yhat": yhat, "yhat_lower": yhat - band, "yhat_upper": yhat + band})
+
+
+class ProphetModel:
+    backend = "prophet"
+
+    def __init__(self, **options: Any) -> None:
+        self.options = options
+        self.model = None
+        self.last_date: pd.Timestamp | None = None
+
+    def fit(self, history: pd.DataFrame) -> "ProphetModel":
+        history = history.dropna(subset=["ds", "y"])
+        self.model = Prophet(**self.options).fit(history[["ds", "y"]])
+        self.last_date = pd.to_datetime(history["ds"]).max()
+        return self
+
+    def predict(self, dates: pd.Series | pd.DatetimeIndex) -> pd.DataFrame:
+        forecast = self.model.predict(pd.DataFrame({"ds": pd.DatetimeIndex(dates)}))
+        return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+
+def create_model(backend: str = "auto", **prophet_options: Any) -> ProphetModel | SeasonalTrendModel:
+    """``backend`` is ``prophet``, ``fallback`` or ``auto`` (Prophet if installed)."""
+    if backend == "prophet" or (backend == "auto" and Prophet is not None):
+        if Prophet is None:
+            raise RuntimeError("prophet is not installed")
+        return ProphetModel(**prophet_options)
+    yearly = prophet_options.get("yearly_seasonality")
+    weekly = prophet_options.get("weekly_seasonality", True)
+    return SeasonalTrendModel(
+        yearly=yearly if isinstance(yearly, bool) else None,
+        weekly=weekly if isinstance(weekly, bool) else True,
+    )
+
+
+def future_dates(model: ProphetModel | SeasonalTrendModel, horizon: int) -> pd.DatetimeIndex:
+    """The ``horizon`` days following the last day of training data."""
+    return pd.date_range(model.last_date + pd.Timedelta(days=1), periods=horizon, freq="D")
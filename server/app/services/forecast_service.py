@@ -1,32 +1,196 @@
 from __future__ import annotations
 
-from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
-from app.config import settings
+from app.services.dataset_registry import Dataset, get_dataset
+from app.services.downsample import lttb_records, resample_records
+from app.services.records import frame_to_records, series_values
+from app.services.time_index import TimeIndex
 
+TIME_COLUMNS = ("ds", "timestamp", "date", "time")
+LOWER_COLUMNS = ("yhat_lower", "lower", "lower_bound")
+UPPER_COLUMNS = ("yhat_upper", "upper", "upper_bound")
+# Field names of the columnar format, and the record keys they are taken from.
+FORECAST_COLUMNS = {"timestamps": "timestamp", "values": "value", "lower": "lower", "upper": "upper"}
+# How daily forecast values combine into weeks and months.
+AGGREGATIONS = {"energy": "sum", "sec": "mean"}
 
-def _resolve_path(file_name: str) -> Path:
-    return Path(settings.data_dir) / file_name
 
+@dataclass(frozen=True)
+class ForecastSchema:
+    """Source columns of a forecast file (``None`` where the file has no such column)."""
 
-def load_forecast(file_name: str, metric: str, limit: int) -> list[dict]:
-    file_path = _resolve_path(file_name)
-    if not file_path.exists():
-        return []
+    time: str | None
+    value: str | None
+    lower: str | None
+    upper: str | None
+
+
+@dataclass
+class ForecastColumns:
+    """Typed columns of one forecast file version, aligned with its rows."""
+
+    timestamps: np.ndarray
+    values: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def detect_schema(dataset: Dataset, metric: str) -> ForecastSchema:
+    return ForecastSchema(
+        time=dataset.column(*TIME_COLUMNS),
+        value=dataset.column("yhat", "value", metric, "forecast"),
+        lower=dataset.column(*LOWER_COLUMNS),
+        upper=dataset.column(*UPPER_COLUMNS),
+    )
+
+
+def _timestamp_strings(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        strings = series.dt.strftime("%Y-%m-%dT%H:%M:%S").str.removesuffix("T00:00:00")
+    else:
+        strings = series.astype("string")
+    return np.array(series_values(strings), dtype=object)
+
+
+def _build_columns(dataset: Dataset, metric: str) -> ForecastColumns:
+    schema = dataset.derived(f"forecast_schema:{metric}", lambda item: detect_schema(item, metric))
+    frame, rows = dataset.frame, len(dataset.frame.index)
+
+    def floats(column: str | None) -> np.ndarray:
+        if column is None:
+            return np.full(rows, np.nan)
+        return pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype="float64")
+
+    timestamps = _timestamp_strings(frame[schema.time]) if schema.time else np.full(rows, None, dtype=object)
+    return ForecastColumns(timestamps, floats(schema.value), floats(schema.lower), floats(schema.upper))
+
+
+def _build_time_index(dataset: Dataset) -> TimeIndex:
+    return TimeIndex.build(dataset.frame, dataset.column(*TIME_COLUMNS))
+
+
+def _floats(values: np.ndarray) -> list[float | None]:
+    result = values.tolist()
+    missing = np.isnan(values)
+    if missing.any():
+        for position in np.flatnonzero(missing):
+            result[position] = None
+    return result
 
-    df = pd.read_csv(file_path)
-    records = []
-    for _, row in df.head(limit).iterrows():
-        record = row.to_dict()
-        records.append(
-            {
-                "timestamp": record.get("timestamp") or record.get("date") or record.get("time"),
-                "value": record.get("value") or record.get(metric) or record.get("forecast"),
-                "metric": metric,
-                "raw": record,
-            }
+
+def _to_records(dataset: Dataset, positions: np.ndarray, metric: str, include_raw: bool = True) -> list[dict]:
+    columns = dataset.derived(f"forecast_columns:{metric}", lambda item: _build_columns(item, metric))
+    raws = frame_to_records(dataset.frame.iloc[positions]) if include_raw else [None] * len(positions)
+    return [
+        {
+            "timestamp": timestamp,
+            "value": value,
+            "lower": lower,
+            "upper": upper,
+            "metric": metric,
+            "raw": raw,
+            "rollup": None,
+        }
+        for timestamp, value, lower, upper, raw in zip(
+            columns.timestamps[positions].tolist(),
+            _floats(columns.values[positions]),
+            _floats(columns.lower[positions]),
+            _floats(columns.upper[positions]),
+            raws,
         )
+    ]
+
+
+def load_forecast(
+    file_name: str,
+    metric: str,
+    limit: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    include_raw: bool = True,
+) -> tuple[list[dict], str | None]:
+    """One page of forecast points ordered by time, plus the cursor of the next page."""
+    dataset = get_dataset(file_name)
+    if dataset is None:
+        return [], None
+
+    index = dataset.derived("time_index", _build_time_index)
+    positions, next_cursor = index.page(start, end, cursor, limit)
+    return _to_records(dataset, positions, metric, include_raw), next_cursor
+
+
+def load_forecast_columns(
+    file_name: str,
+    metric: str,
+    limit: int | None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+) -> tuple[dict[str, np.ndarray], str | None]:
+    """One page as parallel arrays (``timestamps``, ``values``, ``lower``, ``upper``) plus the next cursor."""
+    dataset = get_dataset(file_name)
+    if dataset is None:
+        return {name: np.empty(0) for name in FORECAST_COLUMNS}, None
+
+    index = dataset.derived("time_index", _build_time_index)
+    positions, next_cursor = index.page(start, end, cursor, limit)
+    columns = dataset.derived(f"forecast_columns:{metric}", lambda item: _build_columns(item, metric))
+    arrays = (columns.timestamps, columns.values, columns.lower, columns.upper)
+    return {name: array[positions] for name, array in zip(FORECAST_COLUMNS, arrays)}, next_cursor
+
 
+def iter_forecast(
+    file_name: str,
+    metric: str,
+    limit: int | None = None,
+    chunk_size: int = 500,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    include_raw: bool = True,
+) -> Iterator[list[dict]]:
+    """Yield forecast records chunk by chunk; ``limit=None`` streams the full series."""
+    dataset = get_dataset(file_name)
+    if dataset is None:
+        return
+
+    index = dataset.derived("time_index", _build_time_index)
+    positions, _ = index.page(start, end, cursor, limit)
+    for offset in range(0, len(positions), chunk_size):
+        yield _to_records(dataset, positions[offset : offset + chunk_size], metric, include_raw)
+
+
+def chart_records(
+    records: list[dict], metric: str, resolution: str | None = None, max_points: int | None = None
+) -> list[dict]:
+    """Roll daily forecast records up to ``resolution`` and thin them to ``max_points`` with LTTB."""
+    if resolution not in (None, "day"):
+        records = resample_records(records, resolution, AGGREGATIONS.get(metric, "mean"))
+    if max_points is not None:
+        records = lttb_records(records, max_points)
     return records
+
+
+def load_forecast_chart(
+    file_name: str,
+    metric: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: str | None = None,
+    max_points: int | None = None,
+) -> list[dict]:
+    """The whole forecast between ``start`` and ``end``, summarised for a chart."""
+    dataset = get_dataset(file_name)
+    if dataset is None:
+        return []
+
+    index = dataset.derived("time_index", _build_time_index)
+    positions, _ = index.page(start, end, None, None)
+    return chart_records(_to_records(dataset, positions, metric, include_raw=False), metric, resolution, max_points)
@@ -0,0 +1,259 @@
+"""Live readings pushed through ``POST /ingest``.
+
+Each unit gets a ``RingBuffer`` of the last ``INGEST_BUFFER_CAPACITY``
+readings holding the four raw inputs plus ``total_energy`` and ``SEC``, which
+are derived once per batch on whole arrays. Batches are decoded with a single
+``json.loads`` (NDJSON lines are joined into one array first) and appended
+with one slice assignment per unit, and readers aggregate or score recent
+windows straight from buffer views. While dashboards are subscribed to the
+alert hub, each batch is also scored and its anomalies are pushed to them.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.alert_hub import alert_hub
+from app.services.anomaly_scoring import ENERGY_INPUTS, compute_sec, load_models, score_frame
+from app.services.records import frame_to_records
+from app.services.ring_buffer import RingBuffer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+READING_COLUMNS = (*ENERGY_INPUTS, "production_tons")
+BUFFER_COLUMNS = (*READING_COLUMNS, "total_energy", "SEC")
+
+
+class IngestError(ValueError):
+    """The request body is not a batch of readings."""
+
+
+class BatchTooLarge(IngestError):
+    """More readings in one request than ``INGEST_MAX_BATCH``."""
+
+
+def parse_readings(body: bytes, ndjson: bool = False) -> list[dict[str, Any]]:
+    if ndjson:
+        body = b"[" + b",".join(line for line in body.split(b"\n") if line.strip()) + b"]"
+    try:
+        payload = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as exc:
+        raise IngestError(f"Invalid JSON: {exc}") from exc
+    if isinstance(payload, dict):
+        payload = payload.get("readings")
+    if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+        raise IngestError('Expected a list of readings or {"readings": [...]}')
+    return payload
+
+
+def _unit(row: dict[str, Any]) -> str | None:
+    value = row.get("unit_name") or row.get("unit")
+    return None if value is None or value == "" else str(value)
+
+
+def _timestamps(rows: list[dict[str, Any]]) -> np.ndarray:
+    raw = [row.get("timestamp") for row in rows]
+    now = time.time_ns()
+    if all(value is None for value in raw):
+        return np.full(len(rows), now, dtype=np.int64)
+    raw = pd.Series(raw, dtype=object)
+    # ISO 8601 is parsed in one vectorised pass; anything else falls back to per-value inference.
+    parsed = pd.to_datetime(raw, utc=True, errors="coerce", format="ISO8601")
+    retry = parsed.isna() & raw.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(raw[retry], utc=True, errors="coerce", format="mixed")
+    keys = parsed.to_numpy(dtype="datetime64[ns]").view(np.int64).copy()
+    keys[parsed.isna().to_numpy()] = now
+    return keys
+
+
+def _columns(rows: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(units, timestamps in ns, values)`` of a batch, ``values`` holding one row per buffer column."""
+    units = np.array([_unit(row) for row in rows], dtype=object)
+    try:
+        inputs = [np.array([row.get(name) for row in rows], dtype="float64") for name in READING_COLUMNS]
+    except (TypeError, ValueError) as exc:
+        raise IngestError(f"Reading values must be numbers: {exc}") from exc
+    electricity, steam, fuel, _ = inputs
+    values = np.vstack([*inputs, electricity + steam + fuel, compute_sec(*inputs)])
+    return units, _timestamps(rows), values
+
+
+class LiveStore:
+    def __init__(self, capacity: int, max_units: int) -> None:
+        self.capacity = capacity
+        self.max_units = max_units
+        self._buffers: dict[str, RingBuffer] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def units(self) -> list[str]:
+        return sorted(self._buffers)
+
+    def buffer(self, unit: str) -> RingBuffer | None:
+        return self._buffers.get(unit)
+
+    def _buffer_for(self, unit: str) -> RingBuffer | None:
+        with self._lock:
+            buffer = self._buffers.get(unit)
+            if buffer is None and len(self._buffers) < self.max_units:
+                buffer = self._buffers[unit] = RingBuffer(BUFFER_COLUMNS, self.capacity)
+            return buffer
+
+    def append(self, units: np.ndarray, times: np.ndarray, values: np.ndarray) -> dict[str, int]:
+        """Append a decoded batch; returns the readings accepted per unit."""
+        accepted: dict[str, int] = {}
+        known = units != None  # noqa: E711 - elementwise comparison on an object array
+        for unit in np.unique(units[known].astype(str)):
+            buffer = self._buffer_for(unit)
+            if buffer is None:
+                continue
+            mask = units == unit
+            buffer.extend(times[mask], values[:, mask])
+            accepted[unit] = int(mask.sum())
+
+        total = sum(accepted.values())
+        self.batches += 1
+        self.accepted += total
+        self.rejected += len(units) - total
+        return accepted
+
+    def _selected(self, unit: str | None) -> list[tuple[str, RingBuffer]]:
+        if unit is None:
+            return [(name, self._buffers[name]) for name in self.units()]
+        buffer = self._buffers.get(unit)
+        return [] if buffer is None else [(unit, buffer)]
+
+    def summaries(self, unit: str | None = None, window: int | None = None) -> list[dict[str, Any]]:
+        """KPIs over the last ``window`` readings of each unit, reduced directly from buffer views."""
+        summaries = []
+        for name, buffer in self._selected(unit):
+            with buffer.lock:
+                times, values = buffer.window(window)
+                if not len(times):
+                    continue
+                energy = buffer.column(values, "total_energy")
+                sec = buffer.column(values, "SEC")
+                energy_count = int(np.count_nonzero(~np.isnan(energy)))
+                sec_count = int(np.count_nonzero(~np.isnan(sec)))
+                summary = {
+                    "unit": name,
+                    "readings": len(times),
+                    "start": pd.Timestamp(int(times.min()), tz="UTC").to_pydatetime(warn=False),
+                    "end": pd.Timestamp(int(times.max()), tz="UTC").to_pydatetime(warn=False),
+                    "total_energy": float(np.nansum(energy)) if energy_count else None,
+                    "avg_energy": float(np.nansum(energy)) / energy_count if energy_count else None,
+                    "avg_sec": float(np.nansum(sec)) / sec_count if sec_count else None,
+                }
+            summaries.append(summary)
+        return summaries
+
+    def window_frame(self, unit: str | None = None, window: int | None = None) -> pd.DataFrame:
+        """Recent readings as a frame (a copy, safe to use after the buffer moves on)."""
+        frames = []
+        for name, buffer in self._selected(unit):
+            with buffer.lock:
+                times, values = buffer.window(window)
+                frame = pd.DataFrame(dict(zip(BUFFER_COLUMNS, values.copy())))
+                frame.insert(0, "timestamp", pd.to_datetime(times.copy(), utc=True))
+            frame.insert(1, "unit_name", name)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "unit_name", *BUFFER_COLUMNS])
+        return pd.concat(frames, ignore_index=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "max_units": self.max_units,
+            "batches": self.batches,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "units": {
+                name: {"buffered": len(buffer), "written": buffer.written}
+                for name, buffer in self._selected(None)
+            },
+        }
+
+
+live_store = LiveStore(settings.ingest_buffer_capacity, settings.ingest_max_units)
+
+
+def _isoformat(stamp: int) -> str:
+    # Microsecond precision: ``datetime.fromisoformat`` rejects nanosecond fractions.
+    return pd.Timestamp(int(stamp), tz="UTC").to_pydatetime(warn=False).isoformat()
+
+
+def detect_alerts(
+    units: np.ndarray, times: np.ndarray, values: np.ndarray, accepted: Iterable[str]
+) -> list[dict[str, Any]]:
+    """Alerts for the anomalous readings of the ``accepted`` units in a decoded batch."""
+    models = load_models()
+    if models is None:
+        return []
+    mask = np.isin(units, list(accepted))
+    frame = pd.DataFrame(dict(zip(BUFFER_COLUMNS, values[:, mask])))
+    frame.insert(0, "unit_name", units[mask])
+    scored = score_frame(frame, models)
+    flagged = np.flatnonzero(scored["anomaly"].fillna(False).to_numpy(dtype=bool))
+    return [
+        {
+            "id": f"{unit}:{stamp}",
+            "message": f"Anomaly detected in {unit} (SEC {sec:.2f}).",
+            "severity": severity,
+            "timestamp": _isoformat(stamp),
+            "unit": unit,
+            "score": score,
+            "source": "live_ingest",
+        }
+        for unit, stamp, sec, score, severity in zip(
+            units[mask][flagged],
+            times[mask][flagged],
+            scored["SEC"].to_numpy()[flagged],
+            scored["score"].to_numpy()[flagged].tolist(),
+            scored["severity"].to_numpy()[flagged],
+        )
+    ]
+
+
+def ingest_payload(body: bytes, ndjson: bool = False) -> dict[str, Any]:
+    rows = parse_readings(body, ndjson)
+    if len(rows) > settings.ingest_max_batch:
+        raise BatchTooLarge(f"At most {settings.ingest_max_batch} readings per request")
+    units, times, values = _columns(rows)
+    accepted = live_store.append(units, times, values)
+    total = sum(accepted.values())
+    result = {"accepted": total, "rejected": len(rows) - total, "units": accepted, "alerts": 0}
+    # Scoring is only worth its cost while someone is listening for alerts.
+    if accepted and alert_hub.has_subscribers:
+        alerts = detect_alerts(units, times, values, accepted)
+        alert_hub.publish_threadsafe(alerts)
+        result["alerts"] = len(alerts)
+    return result
+
+
+def score_window(
+    unit: str | None = None, window: int | None = None, only_anomalies: bool = True
+) -> tuple[str, list[dict[str, Any]]] | None:
+    """Score the most recent live readings; ``None`` if no model has been trained yet."""
+    models = load_models()
+    if models is None:
+        return None
+    frame = live_store.window_frame(unit, window)
+    scored = score_frame(frame, models)
+    scored.insert(0, "unit", frame["unit_name"])
+    scored.insert(0, "timestamp", frame["timestamp"].map(lambda value: _isoformat(value.value)))
+    if only_anomalies:
+        scored = scored[scored["anomaly"].fillna(False).astype(bool)]
+    return models.version, frame_to_records(scored)
@@ -0,0 +1,79 @@
+"""JSON encoding shared by responses, NDJSON streams and pushed alerts.
+
+With orjson installed, NumPy arrays and scalars, NaN (as ``null``) and
+datetimes are encoded natively, so services may hand back arrays instead of
+converting them to Python lists first; only what orjson does not know
+(pandas ``Timestamp``/``NaT``, object or non-contiguous arrays) goes through
+``_default``. Without orjson the same values are encoded with the standard
+library, which is slower but produces the same documents.
+
+``FastJSONResponse`` is the app's default response class. Routes whose
+service already builds the documented record shape return it directly, which
+also skips FastAPI validating and re-serialising every record against the
+``response_model`` (the model still documents the route).
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    _LINE_OPTIONS = _OPTIONS | orjson.OPT_APPEND_NEWLINE
+
+
+def array_values(values: np.ndarray) -> list[Any]:
+    """``tolist()`` with NaN (floats) or NaN/NaT/None (objects) mapped to ``None``."""
+    result = values.tolist()
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+    elif values.dtype.kind == "O":
+        missing = np.array([value is None or value != value for value in result], dtype=bool)
+    else:
+        return result
+    for position in np.flatnonzero(missing):
+        result[position] = None
+    return result
+
+
+def _default(value: Any) -> Any:
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return array_values(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if value != value else value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def dumps_lines(items: Iterable[Any]) -> bytes:
+    """Each item encoded on its own newline-terminated line (NDJSON)."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(item, default=_default, option=_LINE_OPTIONS) for item in items)
+    return b"".join(dumps(item) + b"\n" for item in items)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
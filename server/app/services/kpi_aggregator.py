@@ -0,0 +1,238 @@
+"""Incremental KPI aggregation over an append-only CSV.
+
+The aggregator keeps running sums and counts (overall and per group, e.g. per
+unit and per day) together with the byte offset of the last complete line it
+has consumed. Each refresh only parses the bytes appended since then, so the
+cost of a summary no longer grows with the length of the plant history. A
+final line without a newline is a row still being written: it is neither
+counted nor consumed, and is read in full once it is terminated. The file is
+re-aggregated from scratch if it is replaced, truncated or its header changes.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import pandas as pd
+
+from app.services.dataset_registry import find_column
+
+BLOCK_SIZE = 32 * 1024 * 1024
+# Bytes just before the consumed offset that must be unchanged for the file to count as appended to.
+FINGERPRINT_SIZE = 256
+
+
+@dataclass
+class Totals:
+    rows: int = 0
+    energy_sum: float = 0.0
+    energy_count: int = 0
+    sec_sum: float = 0.0
+    sec_count: int = 0
+    anomalies: float = 0.0
+
+    def add(self, other: "Totals") -> None:
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+
+    @classmethod
+    def from_values(cls, values: Sequence[float]) -> "Totals":
+        rows, energy_sum, energy_count, sec_sum, sec_count, anomalies = values
+        return cls(int(rows), float(energy_sum), int(energy_count), float(sec_sum), int(sec_count), float(anomalies))
+
+    def summary(self, has_anomaly: bool) -> dict[str, Any]:
+        return {
+            "readings": self.rows,
+            "total_energy": self.energy_sum if self.energy_count else None,
+            "avg_energy": self.energy_sum / self.energy_count if self.energy_count else None,
+            "avg_sec": self.sec_sum / self.sec_count if self.sec_count else None,
+            "anomaly_rate": self.anomalies / self.rows if has_anomaly and self.rows else None,
+        }
+
+
+@dataclass
+class _State:
+    overall: Totals
+    groups: dict[str, dict[str, Totals]]
+
+    @classmethod
+    def empty(cls, dimensions: Sequence[str]) -> "_State":
+        return cls(Totals(), {name: {} for name in dimensions})
+
+
+# Group dimensions: name -> (column role, function turning that column into group keys).
+Dimension = tuple[str, Callable[[pd.Series], pd.Series]]
+
+
+def _hour_key(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors="coerce").dt.strftime("%Y-%m-%dT%H:00")
+
+
+def _day_key(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors="coerce").dt.strftime("%Y-%m-%d")
+
+
+def _unit_key(values: pd.Series) -> pd.Series:
+    return values.astype(str)
+
+
+DEFAULT_DIMENSIONS: dict[str, Dimension] = {
+    "unit": ("unit", _unit_key),
+    "hour": ("time", _hour_key),
+    "day": ("time", _day_key),
+}
+
+
+class KPIAggregator:
+    def __init__(
+        self,
+        path: Path,
+        columns: dict[str, Sequence[str]],
+        dimensions: dict[str, Dimension] | None = None,
+    ) -> None:
+        """``columns`` maps the roles energy/sec/anomaly/unit/time to candidate column names."""
+        self.path = path
+        self.columns = columns
+        self.dimensions = DEFAULT_DIMENSIONS if dimensions is None else dimensions
+        self._lock = threading.Lock()
+        self._reset()
+        self.refreshes = 0
+        self.rebuilds = 0
+        self.bytes_read = 0
+
+    def _reset(self) -> None:
+        self._inode: int | None = None
+        self._version: tuple[int, int] | None = None
+        self._fingerprint = b""
+        self._header: list[str] | None = None
+        self._resolved: dict[str, str | None] = {}
+        self._offset = 0
+        self._state = _State.empty(self.dimensions)
+
+    def refresh(self) -> bool:
+        """Consume appended rows; returns ``False`` if the file does not exist."""
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._reset()
+                return False
+
+            self.refreshes += 1
+            version = (stat.st_mtime_ns, stat.st_size)
+            if version == self._version:
+                return True
+
+            with self.path.open("rb") as handle:
+                header_line = handle.readline()
+                header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+                if (
+                    self._header is None
+                    or stat.st_ino != self._inode
+                    or stat.st_size < self._offset
+                    or header != self._header
+                    or self._read_fingerprint(handle) != self._fingerprint
+                ):
+                    self._rebuild(stat.st_ino, header, len(header_line))
+                handle.seek(self._offset)
+                self._consume(handle)
+                self._fingerprint = self._read_fingerprint(handle)
+            self._version = version
+            return True
+
+    @property
+    def version(self) -> tuple[int, int] | None:
+        """``(mtime_ns, size)`` of the file as of the last refresh."""
+        return self._version
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return self._state.overall.summary(self._has_anomaly())
+
+    def breakdown(self, dimension: str) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            groups = self._state.groups[dimension]
+            has_anomaly = self._has_anomaly()
+            return {key: groups[key].summary(has_anomaly) for key in sorted(groups)}
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "offset": self._offset,
+                "rows": self._state.overall.rows,
+                "refreshes": self.refreshes,
+                "rebuilds": self.rebuilds,
+                "bytes_read": self.bytes_read,
+            }
+
+    def _read_fingerprint(self, handle: io.BufferedReader) -> bytes:
+        start = max(0, self._offset - FINGERPRINT_SIZE)
+        handle.seek(start)
+        return handle.read(self._offset - start)
+
+    def _has_anomaly(self) -> bool:
+        return self._resolved.get("anomaly") is not None
+
+    def _rebuild(self, inode: int, header: list[str], header_size: int) -> None:
+        self._reset()
+        self._inode = inode
+        self._header = header
+        self._resolved = {role: find_column(header, candidates) for role, candidates in self.columns.items()}
+        self._offset = header_size
+        self.rebuilds += 1
+
+    def _consume(self, handle: io.BufferedReader) -> None:
+        # Only complete lines are applied; the offset stays at the start of a partial last line.
+        carry = b""
+        while True:
+            block = handle.read(BLOCK_SIZE)
+            if not block:
+                break
+            self.bytes_read += len(block)
+            data = carry + block
+            cut = data.rfind(b"\n") + 1
+            if cut:
+                self._apply(self._state, data[:cut])
+                self._offset += cut
+            carry = data[cut:]
+
+    def _apply(self, state: _State, data: bytes) -> None:
+        frame = pd.read_csv(io.BytesIO(data), header=None, names=self._header)
+        if frame.empty:
+            return
+
+        energy = self._numeric(frame, "energy")
+        sec = self._numeric(frame, "sec")
+        anomaly = self._numeric(frame, "anomaly")
+        parts = pd.DataFrame(
+            {
+                "rows": 1,
+                "energy_sum": energy.fillna(0.0),
+                "energy_count": energy.notna().astype(int),
+                "sec_sum": sec.fillna(0.0),
+                "sec_count": sec.notna().astype(int),
+                "anomalies": anomaly.fillna(0.0),
+            },
+            index=frame.index,
+        )
+
+        state.overall.add(Totals.from_values(parts.sum().tolist()))
+        for name, (role, to_key) in self.dimensions.items():
+            column = self._resolved.get(role)
+            if column is None:
+                continue
+            grouped = parts.groupby(to_key(frame[column]), dropna=True).sum()
+            groups = state.groups[name]
+            for key, *values in grouped.itertuples(name=None):
+                groups.setdefault(str(key), Totals()).add(Totals.from_values(values))
+
+    def _numeric(self, frame: pd.DataFrame, role: str) -> pd.Series:
+        column = self._resolved.get(role)
+        if column is None:
+            return pd.Series(float("nan"), index=frame.index)
+        return pd.to_numeric(frame[column], errors="coerce")
@@ -1,37 +1,45 @@
 from __future__ import annotations
 
+import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
-import pandas as pd
+from pymongo.errors import PyMongoError
 
-from app.config import settings
+from app.services.anomaly_service import ANOMALY_COLUMNS, ANOMALY_FILE, TIME_COLUMNS, UNIT_COLUMNS
+from app.services.dataset_registry import resolve_path
+from app.services.executor import run_io
+from app.services.kpi_aggregator import KPIAggregator
 
+ENERGY_COLUMNS = ("energy", "energy_consumption", "total_energy", "energy_kwh", "consumption")
+SEC_COLUMNS = ("sec", "specific_energy_consumption", "sec_value")
+KPI_COLUMNS = {
+    "energy": ENERGY_COLUMNS,
+    "sec": SEC_COLUMNS,
+    "anomaly": ANOMALY_COLUMNS,
+    "unit": UNIT_COLUMNS,
+    "time": TIME_COLUMNS,
+}
 
-def _resolve_path(file_name: str) -> Path:
-    return Path(settings.data_dir) / file_name
+logger = logging.getLogger(__name__)
 
+_aggregators: dict[Path, KPIAggregator] = {}
+# Requests reach this from several I/O pool threads; two aggregators for one file would each tail it.
+_aggregators_lock = threading.Lock()
 
-def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    lowered = {col.lower(): col for col in df.columns}
-    for name in candidates:
-        if name.lower() in lowered:
-            return lowered[name.lower()]
-    return None
 
-
-def _safe_float(value) -> float | None:
-    try:
-        if pd.isna(value):
-            return None
-        return float(value)
-    except Exception:
-        return None
+def get_aggregator() -> KPIAggregator:
+    path = resolve_path(ANOMALY_FILE)
+    with _aggregators_lock:
+        if path not in _aggregators:
+            _aggregators[path] = KPIAggregator(path, KPI_COLUMNS)
+        return _aggregators[path]
 
 
 def compute_kpi_summary() -> dict:
-    file_path = _resolve_path("final_refinery_data_with_anomalies.csv")
-    if not file_path.exists():
+    aggregator = get_aggregator()
+    if not aggregator.refresh():
         return {
             "total_energy": None,
             "avg_energy": None,
@@ -40,67 +48,105 @@ def compute_kpi_summary() -> dict:
             "last_updated": datetime.now(timezone.utc),
         }
 
-    df = pd.read_csv(file_path)
-    energy_col = _find_column(
-        df,
-        ["energy", "energy_consumption", "total_energy", "energy_kwh", "consumption"],
-    )
-    sec_col = _find_column(df, ["sec", "specific_energy_consumption", "sec_value"])
-    anomaly_col = _find_column(df, ["anomaly", "is_anomaly", "anomaly_flag"])
+    summary = aggregator.summary()
+    return {
+        "total_energy": summary["total_energy"],
+        "avg_energy": summary["avg_energy"],
+        "avg_sec": summary["avg_sec"],
+        "anomaly_rate": summary["anomaly_rate"],
+        "last_updated": datetime.now(timezone.utc),
+    }
 
-    total_energy = _safe_float(df[energy_col].sum()) if energy_col else None
-    avg_energy = _safe_float(df[energy_col].mean()) if energy_col else None
-    avg_sec = _safe_float(df[sec_col].mean()) if sec_col else None
 
-    anomaly_rate = None
-    if anomaly_col and len(df.index) > 0:
-        try:
-            anomaly_rate = float(df[anomaly_col].sum()) / float(len(df.index))
-        except Exception:
-            anomaly_rate = None
+def compute_kpi_breakdown(dimension: str) -> list[dict]:
+    """KPIs per group for ``dimension`` ("unit", "hour" or "day")."""
+    aggregator = get_aggregator()
+    if not aggregator.refresh():
+        return []
+    return [{"key": key, **values} for key, values in aggregator.breakdown(dimension).items()]
+
+
+SNAPSHOT_PROJECTION = {
+    "_id": 1,
+    "timestamp": 1,
+    "total_energy": 1,
+    "avg_energy": 1,
+    "avg_sec": 1,
+    "anomaly_rate": 1,
+}
+# Snapshots written before the background writer have no granularity and may
+# carry ``last_updated`` instead of ``timestamp``; they are read as a fallback.
+LEGACY_SNAPSHOT_FILTER = {"granularity": {"$exists": False}}
+LEGACY_SNAPSHOT_SORT = [("timestamp", -1), ("last_updated", -1)]
 
+
+def _snapshot(item: dict) -> dict:
     return {
-        "total_energy": total_energy,
-        "avg_energy": avg_energy,
-        "avg_sec": avg_sec,
-        "anomaly_rate": anomaly_rate,
-        "last_updated": datetime.now(timezone.utc),
+        "id": str(item.get("_id")),
+        "total_energy": item.get("total_energy"),
+        "avg_energy": item.get("avg_energy"),
+        "avg_sec": item.get("avg_sec"),
+        "anomaly_rate": item.get("anomaly_rate"),
+        "last_updated": item.get("timestamp") or item.get("last_updated"),
     }
 
 
 async def get_latest_snapshot(db) -> dict:
     if db is None:
-        return compute_kpi_summary()
+        return await run_io(compute_kpi_summary)
 
-    snapshot = await db.kpi_snapshots.find_one(sort=[("timestamp", -1)])
+    try:
+        snapshot = await db.kpi_snapshots.find_one(
+            {"granularity": "overall"}, SNAPSHOT_PROJECTION, sort=[("timestamp", -1)]
+        )
+        if snapshot is None:
+            snapshot = await db.kpi_snapshots.find_one(LEGACY_SNAPSHOT_FILTER, sort=LEGACY_SNAPSHOT_SORT)
+    except PyMongoError as exc:
+        # Mongo being down must not take the CSV-backed summary with it.
+        logger.warning("Could not read KPI snapshots, computing from CSV: %s", exc)
+        snapshot = None
     if snapshot:
-        return {
-            "total_energy": snapshot.get("total_energy"),
-            "avg_energy": snapshot.get("avg_energy"),
-            "avg_sec": snapshot.get("avg_sec"),
-            "anomaly_rate": snapshot.get("anomaly_rate"),
-            "last_updated": snapshot.get("timestamp") or snapshot.get("last_updated"),
-            "id": str(snapshot.get("_id")),
-        }
+        return _snapshot(snapshot)
 
-    return compute_kpi_summary()
+    return await run_io(compute_kpi_summary)
 
 
 async def list_snapshots(db, limit: int) -> list[dict]:
     if db is None:
         return []
 
-    cursor = db.kpi_snapshots.find().sort("timestamp", -1).limit(limit)
-    snapshots = []
-    async for item in cursor:
-        snapshots.append(
-            {
-                "id": str(item.get("_id")),
-                "total_energy": item.get("total_energy"),
-                "avg_energy": item.get("avg_energy"),
-                "avg_sec": item.get("avg_sec"),
-                "anomaly_rate": item.get("anomaly_rate"),
-                "last_updated": item.get("timestamp") or item.get("last_updated"),
-            }
-        )
+    # Every projected field is part of the granularity_timestamp_kpis index, so this is a covered scan.
+    cursor = (
+        db.kpi_snapshots.find({"granularity": "overall"}, SNAPSHOT_PROJECTION)
+        .sort("timestamp", -1)
+        .limit(limit)
+    )
+    try:
+        snapshots = [_snapshot(item) async for item in cursor]
+        if len(snapshots) < limit:
+            # Older than any overall snapshot, so they continue the newest-first list.
+            legacy = (
+                db.kpi_snapshots.find(LEGACY_SNAPSHOT_FILTER).sort(LEGACY_SNAPSHOT_SORT).limit(limit - len(snapshots))
+            )
+            snapshots.extend([_snapshot(item) async for item in legacy])
+    except PyMongoError as exc:
+        # There is no CSV history of snapshots, so the list is empty as it is without Mongo.
+        logger.warning("Could not list KPI snapshots: %s", exc)
+        return []
     return snapshots
+
+
+async def list_rollups(db, granularity: str, limit: int) -> list[dict]:
+    """Materialised rollups for ``granularity``, newest key first; computed live if Mongo is absent or down."""
+    if db is not None:
+        cursor = (
+            db.kpi_snapshots.find({"granularity": granularity}, {"_id": 0, "granularity": 0, "timestamp": 0})
+            .sort("key", -1)
+            .limit(limit)
+        )
+        try:
+            return [item async for item in cursor]
+        except PyMongoError as exc:
+            logger.warning("Could not read KPI rollups, computing from CSV: %s", exc)
+
+    return list(reversed(await run_io(compute_kpi_breakdown, granularity)))[:limit]
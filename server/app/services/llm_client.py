@@ -0,0 +1,207 @@
+"""Long-lived LLM client used by the chatbot.
+
+The backend is created once at startup (``start_llm_client``) rather than per
+request. Calls are async, limited to ``LLM_MAX_CONCURRENCY`` in flight (callers
+wait at most ``LLM_QUEUE_TIMEOUT_SECONDS`` for a slot) and bounded by
+``LLM_TIMEOUT_SECONDS``; streamed replies fail if no chunk arrives within
+``LLM_STREAM_IDLE_TIMEOUT_SECONDS``.
+
+``LLM_BACKEND=fake`` swaps Gemini for a local backend that streams a canned
+reply word by word, for tests and load runs without an API key.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Protocol
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Contents = list[str]
+
+UNCONFIGURED_REPLY = "Gemini API key is not configured. Set GEMINI_API_KEY in the server .env file."
+
+
+class LLMUnavailable(Exception):
+    """Base class for failures to obtain a reply from the LLM backend."""
+
+
+class LLMBusy(LLMUnavailable):
+    """No concurrency slot became free within the queue timeout."""
+
+
+class LLMTimeout(LLMUnavailable):
+    """The backend did not answer (or stopped streaming) within the timeout."""
+
+
+class LLMBackendError(LLMUnavailable):
+    """The backend rejected or failed the call (auth, quota, network, blocked prompt)."""
+
+
+class LLMBackend(Protocol):
+    model_name: str | None
+
+    async def generate(self, contents: Contents) -> str: ...
+
+    def stream(self, contents: Contents) -> AsyncIterator[str]: ...
+
+
+class GeminiBackend:
+    def __init__(self, api_key: str, model_name: str, timeout: float) -> None:
+        import google.generativeai as genai
+        from google.api_core.exceptions import GoogleAPIError
+
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+        self._request_options = {"timeout": timeout}
+        self.model_name = self._model.model_name
+        # What the SDK raises for a failed call: API errors (auth, quota, and network
+        # failures once retries give up) and prompts or replies blocked by safety settings.
+        self._errors = (GoogleAPIError, genai.types.BlockedPromptException, genai.types.StopCandidateException)
+
+    def _failed(self, exc: Exception) -> LLMBackendError:
+        logger.warning("Gemini call failed: %s", exc)
+        return LLMBackendError("LLM backend request failed")
+
+    async def generate(self, contents: Contents) -> str:
+        try:
+            response = await self._model.generate_content_async(contents, request_options=self._request_options)
+            return response.text
+        except (*self._errors, ValueError) as exc:
+            # ``response.text`` raises ValueError when the reply has no text (e.g. it was blocked).
+            raise self._failed(exc) from exc
+
+    async def stream(self, contents: Contents) -> AsyncIterator[str]:
+        try:
+            response = await self._model.generate_content_async(
+                contents, stream=True, request_options=self._request_options
+            )
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk without text parts (e.g. only safety ratings or a finish reason).
+                    continue
+                if text:
+                    yield text
+        except self._errors as exc:
+            raise self._failed(exc) from exc
+
+
+class FakeBackend:
+    """Deterministic local backend: replies by restating the question, one word per chunk."""
+
+    model_name = "fake"
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def _reply(self, contents: Contents) -> str:
+        prompt, message = "\n".join(contents[:-1]), contents[-1]
+        return f"You asked: {message.strip()} (answered from {len(prompt)} characters of context)"
+
+    async def generate(self, contents: Contents) -> str:
+        await asyncio.sleep(self.delay)
+        return self._reply(contents)
+
+    async def stream(self, contents: Contents) -> AsyncIterator[str]:
+        words = self._reply(contents).split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(self.delay / len(words))
+            yield word if index == 0 else " " + word
+
+
+class UnconfiguredBackend:
+    model_name = None
+
+    async def generate(self, contents: Contents) -> str:
+        return UNCONFIGURED_REPLY
+
+    async def stream(self, contents: Contents) -> AsyncIterator[str]:
+        yield UNCONFIGURED_REPLY
+
+
+class LLMClient:
+    def __init__(
+        self,
+        backend: LLMBackend,
+        max_concurrency: int,
+        timeout: float,
+        queue_timeout: float,
+        idle_timeout: float,
+    ) -> None:
+        self.backend = backend
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.idle_timeout = idle_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def model_name(self) -> str | None:
+        return self.backend.model_name
+
+    async def _acquire(self) -> None:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise LLMBusy("Too many chatbot requests in flight") from None
+
+    async def generate(self, contents: Contents) -> str:
+        await self._acquire()
+        try:
+            return await asyncio.wait_for(self.backend.generate(contents), self.timeout)
+        except asyncio.TimeoutError:
+            raise LLMTimeout("LLM backend timed out") from None
+        finally:
+            self._slots.release()
+
+    async def stream(self, contents: Contents) -> AsyncIterator[str]:
+        await self._acquire()
+        chunks = self.backend.stream(contents).__aiter__()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(chunks.__anext__(), self.idle_timeout)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise LLMTimeout("LLM backend stopped streaming") from None
+        finally:
+            self._slots.release()
+            await chunks.aclose()
+
+
+def _create_backend() -> LLMBackend:
+    if settings.llm_backend == "fake":
+        return FakeBackend(settings.fake_llm_delay_ms / 1000)
+    if not settings.gemini_api_key:
+        return UnconfiguredBackend()
+    return GeminiBackend(settings.gemini_api_key, settings.gemini_model, settings.llm_timeout_seconds)
+
+
+_client: LLMClient | None = None
+
+
+def start_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        _client = LLMClient(
+            _create_backend(),
+            max_concurrency=settings.llm_max_concurrency,
+            timeout=settings.llm_timeout_seconds,
+            queue_timeout=settings.llm_queue_timeout_seconds,
+            idle_timeout=settings.llm_stream_idle_timeout_seconds,
+        )
+        logger.info("LLM client ready (model=%s)", _client.model_name)
+    return _client
+
+
+def get_llm_client() -> LLMClient:
+    return _client if _client is not None else start_llm_client()
+
+
+def stop_llm_client() -> None:
+    global _client
+    _client = None
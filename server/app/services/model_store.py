@@ -0,0 +1,121 @@
+"""Versioned on-disk store for trained model artifacts.
+
+Layout under ``MODELS_DIR`` (default ``<data_dir>/models``)::
+
+    <kind>/<version>/manifest.json   metadata, including the artifact file names
+    <kind>/<version>/<name>.joblib   one pickled estimator per artifact
+    <kind>/CURRENT                   version served by the API
+
+A version directory is complete before ``CURRENT`` is switched to it (an
+atomic rename), so readers never see a half-written model set. Loaded
+versions are memoised per process.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+try:
+    import joblib
+except ImportError:  # pragma: no cover - optional dependency
+    joblib = None
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+_lock = threading.Lock()
+_loaded: dict[tuple[str, str], tuple[dict[str, Any], dict[str, Any]]] = {}
+
+
+def is_available() -> bool:
+    return joblib is not None
+
+
+def models_dir() -> Path:
+    return Path(settings.models_dir) if settings.models_dir else Path(settings.data_dir) / "models"
+
+
+def new_version() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name) + ".joblib"
+
+
+def current_version(kind: str) -> str | None:
+    try:
+        return (models_dir() / kind / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def save_artifacts(
+    kind: str,
+    artifacts: dict[str, Any],
+    manifest: dict[str, Any],
+    version: str | None = None,
+    activate: bool = True,
+) -> str:
+    """Write ``artifacts`` as a new version of ``kind``; returns the version string."""
+    if joblib is None:
+        raise RuntimeError("joblib is not installed")
+    version = version or new_version()
+    directory = models_dir() / kind / version
+    directory.mkdir(parents=True, exist_ok=False)
+
+    files = {}
+    for name, artifact in artifacts.items():
+        files[name] = _file_name(name)
+        joblib.dump(artifact, directory / files[name])
+    manifest = {**manifest, "kind": kind, "version": version, "files": files}
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, default=str))
+
+    if activate:
+        activate_version(kind, version)
+    return version
+
+
+def activate_version(kind: str, version: str) -> None:
+    if not (models_dir() / kind / version / MANIFEST_FILE).exists():
+        raise FileNotFoundError(f"No {kind} model version {version}")
+    pointer = models_dir() / kind / CURRENT_FILE
+    staging = pointer.with_suffix(".tmp")
+    staging.write_text(version)
+    staging.replace(pointer)
+
+
+def load_artifacts(kind: str, version: str | None = None) -> tuple[dict[str, Any], dict[str, Any]] | None:
+    """``(manifest, artifacts)`` for ``version`` (default: the current one), or ``None`` if absent."""
+    if joblib is None:
+        return None
+    version = version or current_version(kind)
+    if version is None:
+        return None
+
+    with _lock:
+        if (kind, version) not in _loaded:
+            directory = models_dir() / kind / version
+            try:
+                manifest = json.loads((directory / MANIFEST_FILE).read_text())
+            except FileNotFoundError:
+                return None
+            artifacts = {name: joblib.load(directory / file) for name, file in manifest["files"].items()}
+            # Keep only the most recently loaded version of each kind in memory.
+            for key in [key for key in _loaded if key[0] == kind]:
+                del _loaded[key]
+            _loaded[(kind, version)] = (manifest, artifacts)
+        return _loaded[(kind, version)]
+
+
+def list_versions(kind: str) -> list[str]:
+    directory = models_dir() / kind
+    if not directory.is_dir():
+        return []
+    return sorted(path.name for path in directory.iterdir() if (path / MANIFEST_FILE).exists())
@@ -0,0 +1,147 @@
+"""Argon2 password hashing on a bounded worker pool.
+
+Each hash or verify costs tens of milliseconds of CPU and ``ARGON2_MEMORY_COST``
+KiB of memory, so it runs on a dedicated pool of ``PASSWORD_HASH_WORKERS``
+threads (argon2-cffi releases the GIL) instead of the event loop. At most
+``PASSWORD_HASH_MAX_PENDING`` calls may be running or queued; beyond that
+``HashingBusy`` is raised so callers can shed load instead of queueing
+indefinitely.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool already has the maximum number of pending calls."""
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        # Updated from the worker threads as calls start and finish, so guarded by a lock.
+        # A call stays pending until its worker finishes, even if the awaiting request was cancelled.
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.peak_queued = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingBusy("Password hashing queue is full")
+            self._pending += 1
+            self.peak_queued = max(self.peak_queued, self._pending - self._running)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="refineryiq-hash")
+
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            self._on_start((time.perf_counter() - submitted) * 1000)
+            try:
+                result = func(*args)
+            except BaseException:
+                self._on_finish(failed=True)
+                raise
+            self._on_finish(failed=False)
+            return result
+
+        future = self._executor.submit(call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_start(self, wait_ms: float) -> None:
+        with self._lock:
+            self._running += 1
+            self._started += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def _on_finish(self, failed: bool) -> None:
+        with self._lock:
+            self._running -= 1
+            self._pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled while still queued never reaches a worker, so release its slot here.
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.wait_ms_total / self._started if self._started else 0.0,
+                "max_wait_ms": self.wait_ms_max,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(settings.password_hash_workers, settings.password_hash_max_pending)
+
+
+def _normalize(password: str) -> str:
+    # SHA-256 first so Argon2 input length is bounded regardless of password length.
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    try:
+        return pwd_context.verify_and_update(_normalize(password), hashed_password)
+    except ValueError:
+        # Missing or unrecognised stored hash.
+        return False, None
+
+
+async def hash_password(password: str) -> str:
+    return await hashing_pool.run(pwd_context.hash, _normalize(password))
+
+
+async def verify_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Check ``password``; also returns a fresh hash if the stored one uses outdated parameters."""
+    return await hashing_pool.run(_verify_and_update, password, hashed_password)
@@ -1,33 +1,25 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from pathlib import Path
 
-import pandas as pd
+from app.services.dataset_registry import get_dataset
+from app.services.records import coalesce_values
 
-from app.config import settings
-
-
-def _resolve_path(file_name: str) -> Path:
-    return Path(settings.data_dir) / file_name
+RECOMMENDATION_FILE = "optimization_recommendations.csv"
 
 
 def load_recommendations(limit: int) -> list[dict]:
-    file_path = _resolve_path("optimization_recommendations.csv")
-    if not file_path.exists():
+    dataset = get_dataset(RECOMMENDATION_FILE)
+    if dataset is None:
         return []
 
-    df = pd.read_csv(file_path)
-    records = []
-    for _, row in df.head(limit).iterrows():
-        record = row.to_dict()
-        records.append(
-            {
-                "title": record.get("title") or record.get("recommendation") or "Optimization",
-                "description": record.get("description") or record.get("details"),
-                "impact": record.get("impact") or record.get("benefit"),
-                "timestamp": datetime.now(timezone.utc),
-            }
+    page = dataset.frame.head(limit)
+    now = datetime.now(timezone.utc)
+    return [
+        {"title": title, "description": description, "impact": impact, "timestamp": now}
+        for title, description, impact in zip(
+            coalesce_values(page, ["title", "recommendation"], default="Optimization"),
+            coalesce_values(page, ["description", "details"]),
+            coalesce_values(page, ["impact", "benefit"]),
         )
-
-    return records
+    ]
@@ -0,0 +1,72 @@
+"""Column-wise conversion of data frames into JSON-ready records.
+
+Every helper works on whole columns: values are pulled out with ``tolist()``
+(which yields native Python scalars) and missing values are replaced with
+``None`` using one ``isna`` mask per column rather than a check per cell.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+
+def series_values(series: pd.Series) -> list[Any]:
+    values = series.tolist()
+    missing = series.isna().to_numpy()
+    if missing.any():
+        for position in np.flatnonzero(missing):
+            values[position] = None
+    return values
+
+
+def column_values(frame: pd.DataFrame, column: str | None) -> list[Any]:
+    """Values of ``column`` with NaN mapped to ``None``; all ``None`` if the column is absent."""
+    if column is None or column not in frame.columns:
+        return [None] * len(frame.index)
+    return series_values(frame[column])
+
+
+def float_values(frame: pd.DataFrame, column: str | None) -> list[float | None]:
+    if column is None or column not in frame.columns:
+        return [None] * len(frame.index)
+    return series_values(pd.to_numeric(frame[column], errors="coerce").astype("float64"))
+
+
+def coalesce_values(
+    frame: pd.DataFrame, candidates: Iterable[str], default: Any = None
+) -> list[Any]:
+    """First non-missing value per row across ``candidates`` (exact column names)."""
+    present = [name for name in candidates if name in frame.columns]
+    if not present:
+        return [default] * len(frame.index)
+
+    combined = frame[present[0]]
+    for name in present[1:]:
+        combined = combined.where(combined.notna(), frame[name])
+    values = series_values(combined)
+    if default is not None:
+        values = [default if value is None else value for value in values]
+    return values
+
+
+def frame_to_records(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Equivalent of ``to_dict("records")`` with NaN/NaT mapped to ``None``."""
+    if frame.empty:
+        return []
+    keys = [str(name) for name in frame.columns]
+    columns = [series_values(frame.iloc[:, index]) for index in range(frame.shape[1])]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def iter_frame_chunks(
+    frame: pd.DataFrame, chunk_size: int, positions: np.ndarray | None = None
+) -> Iterator[pd.DataFrame]:
+    """Yield frame rows (all, or only ``positions`` in that order) ``chunk_size`` at a time."""
+    if positions is None:
+        for start in range(0, len(frame.index), chunk_size):
+            yield frame.iloc[start : start + chunk_size]
+        return
+    for start in range(0, len(positions), chunk_size):
+        yield frame.iloc[positions[start : start + chunk_size]]
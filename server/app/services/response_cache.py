@@ -0,0 +1,141 @@
+"""In-memory cache of chatbot replies.
+
+Entries are keyed on the normalised question (case, punctuation and spacing
+ignored) plus a fingerprint of the context the prompt was built from, so a
+cached answer is only reused while the KPIs, alerts and recommendations it
+was based on are unchanged. Entries expire after ``CHATBOT_CACHE_TTL_SECONDS``
+and the least recently used one is evicted beyond
+``CHATBOT_CACHE_MAX_ENTRIES``.
+
+If ``CHATBOT_CACHE_SIMILARITY`` is set, a miss on the exact key falls back to
+the most similar cached question with the same context, compared by cosine
+similarity of hashed word/character-trigram vectors (computed locally; no
+model or network call).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+EMBEDDING_DIMS = 512
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_message(message: str) -> str:
+    return _NON_WORD.sub(" ", message.casefold()).strip()
+
+
+def context_fingerprint(context: Any) -> str:
+    payload = json.dumps(context, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def embed(text: str, dims: int = EMBEDDING_DIMS) -> np.ndarray:
+    """Unit-length signed feature-hashing vector of words and character trigrams."""
+    padded = f" {text} "
+    features = text.split() + [padded[index : index + 3] for index in range(len(padded) - 2)]
+    vector = np.zeros(dims, dtype=np.float32)
+    for feature in features:
+        hashed = _feature_hash(feature)
+        vector[hashed % dims] += 1.0 if hashed >> 63 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class CachedReply:
+    reply: str
+    model: str | None
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl: float, similarity: float | None = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries: OrderedDict[tuple[str, str], CachedReply] = OrderedDict()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, message: str, context: Any) -> CachedReply | None:
+        key = (context_fingerprint(context), normalize_message(message))
+        entry = self._live(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        if self.similarity is not None:
+            entry = self._nearest(key)
+            if entry is not None:
+                self.similar_hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, message: str, context: Any, reply: str, model: str | None) -> None:
+        key = (context_fingerprint(context), normalize_message(message))
+        embedding = embed(key[1]) if self.similarity is not None else None
+        self._entries[key] = CachedReply(reply, model, time.monotonic() + self.ttl, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "similarity": self.similarity,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.similar_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _live(self, key: tuple[str, str]) -> CachedReply | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _nearest(self, key: tuple[str, str]) -> CachedReply | None:
+        fingerprint, normalized = key
+        candidates = [
+            other for other, entry in self._entries.items() if other[0] == fingerprint and entry.embedding is not None
+        ]
+        if not candidates:
+            return None
+        matrix = np.stack([self._entries[other].embedding for other in candidates])
+        scores = matrix @ embed(normalized)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        return self._live(candidates[best])
@@ -0,0 +1,59 @@
+"""Fixed-capacity, array-backed ring buffer of numeric readings.
+
+Every row is written twice, at slot ``i`` and ``i + capacity`` of arrays that
+are twice the capacity long. The most recent ``n`` rows therefore always sit
+in one contiguous slice ending at ``head + capacity``, so a window is a NumPy
+view (no copy, no wrap-around handling) however far the buffer has rotated.
+"""
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, columns: tuple[str, ...], capacity: int) -> None:
+        self.columns = columns
+        self.capacity = capacity
+        self._index = {name: position for position, name in enumerate(columns)}
+        self._values = np.full((len(columns), 2 * capacity), np.nan)
+        self._times = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0
+        self.written = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def extend(self, times: np.ndarray, values: np.ndarray) -> None:
+        """Append rows; ``values`` has one row per column (shape ``(len(columns), n)``)."""
+        count = len(times)
+        if count > self.capacity:
+            times, values = times[-self.capacity :], values[:, -self.capacity :]
+        with self.lock:
+            start = 0
+            while start < len(times):
+                # Write up to the end of the first half, then wrap to slot 0.
+                stop = min(len(times), start + self.capacity - self._head)
+                slots = slice(self._head, self._head + stop - start)
+                mirror = slice(slots.start + self.capacity, slots.stop + self.capacity)
+                self._times[slots] = self._times[mirror] = times[start:stop]
+                self._values[:, slots] = self._values[:, mirror] = values[:, start:stop]
+                self._head = (self._head + stop - start) % self.capacity
+                start = stop
+            self.written += count
+
+    def window(self, size: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Views of the last ``size`` rows (all buffered rows by default), oldest first.
+
+        The views alias the buffer, so hold ``lock`` while taking and using them
+        if writers may run concurrently (or copy what must outlive the lock).
+        """
+        available = len(self)
+        size = available if size is None else min(size, available)
+        end = self._head + self.capacity
+        return self._times[end - size : end], self._values[:, end - size : end]
+
+    def column(self, values: np.ndarray, name: str) -> np.ndarray:
+        return values[self._index[name]]
@@ -0,0 +1,165 @@
+"""Precomputed rollup pyramid of the plant history for charts.
+
+For each resolution (``raw``, ``day``, ``week``, ``month``) and each unit, plus
+the plant as a whole (``all``), the history is aggregated once per dataset
+version into per-period ``count``, ``sum``, ``mean``, ``min``, ``max`` and
+``p95`` of total energy and SEC. A chart request then slices the level whose
+resolution fits its point budget (``resolution=auto``) and thins it with LTTB
+only if even the coarsest level is too long, so the payload size is bounded by
+``max_points`` whatever the time range.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.anomaly_index import UNKNOWN
+from app.services.anomaly_scoring import ENERGY_INPUTS
+from app.services.dataset_registry import Dataset, get_dataset
+from app.services.downsample import RESOLUTION_FREQ, lttb
+from app.services.forecast_models import PLANT
+from app.services.records import frame_to_records
+from app.services.time_index import to_key
+from app.services.training import HISTORY_FILE
+
+RESOLUTIONS = ("raw", *RESOLUTION_FREQ)
+STATS = ("sum", "mean", "min", "max", "p95")
+# metric -> history column, and the statistic charted by default
+METRICS = {"energy": ("total_energy", "sum"), "sec": ("SEC", "mean")}
+TIME_COLUMNS = ("date", "ds", "timestamp", "time")
+UNIT_COLUMNS = ("unit_name", "unit", "unit_id")
+# Pyramid key of the whole-plant levels; not a string, so no unit in the data can take it over.
+PLANT_KEY = None
+
+
+@dataclass
+class Level:
+    """One resolution of one unit: period starts (ns, ascending) and a stats frame aligned with them."""
+
+    keys: np.ndarray
+    frame: pd.DataFrame
+
+    def between(self, start: datetime | None, end: datetime | None) -> pd.DataFrame:
+        lower = 0 if start is None else int(np.searchsorted(self.keys, to_key(start), side="left"))
+        upper = len(self.keys) if end is None else int(np.searchsorted(self.keys, to_key(end), side="right"))
+        return self.frame.iloc[lower:upper]
+
+
+def _prepare(dataset: Dataset) -> pd.DataFrame:
+    frame = dataset.frame
+    time_col = dataset.column(*TIME_COLUMNS)
+    unit_col = dataset.column(*UNIT_COLUMNS)
+    prepared = pd.DataFrame(
+        {"time": pd.to_datetime(frame[time_col], errors="coerce") if time_col else pd.NaT}, index=frame.index
+    )
+    if unit_col:
+        # Units match case-insensitively, as in the anomaly index.
+        prepared["unit"] = frame[unit_col].fillna(UNKNOWN).astype(str).str.casefold()
+    energy_col, sec_col = dataset.column("total_energy"), dataset.column("SEC", "sec")
+    if energy_col is not None:
+        energy = pd.to_numeric(frame[energy_col], errors="coerce")
+    else:
+        energy = sum(pd.to_numeric(frame[column], errors="coerce") for column in ENERGY_INPUTS if column in frame)
+    if sec_col is not None:
+        sec = pd.to_numeric(frame[sec_col], errors="coerce")
+    elif "production_tons" in frame:
+        production = pd.to_numeric(frame["production_tons"], errors="coerce")
+        sec = energy / production.where(production > 0)
+    else:
+        sec = np.nan
+    prepared["energy"], prepared["sec"] = energy, sec
+    return prepared.dropna(subset=["time"])
+
+
+def _aggregate(frame: pd.DataFrame, period: pd.Series) -> pd.DataFrame:
+    grouped = frame.groupby(period)[["energy", "sec"]]
+    stats = grouped.agg(["count", "sum", "mean", "min", "max"])
+    p95 = grouped.quantile(0.95)
+    columns = {"count": stats[("energy", "count")]}
+    for metric in ("energy", "sec"):
+        for stat in ("sum", "mean", "min", "max"):
+            columns[f"{metric}_{stat}"] = stats[(metric, stat)]
+        columns[f"{metric}_p95"] = p95[metric]
+    result = pd.DataFrame(columns)
+    result.index.name = "time"
+    return result.sort_index()
+
+
+def _build_pyramid(dataset: Dataset) -> dict[tuple[str, str | None], Level]:
+    prepared = _prepare(dataset)
+    periods = {"raw": prepared["time"]}
+    for resolution, freq in RESOLUTION_FREQ.items():
+        periods[resolution] = prepared["time"].dt.to_period(freq).dt.start_time
+
+    levels: dict[tuple[str, str | None], Level] = {}
+    units = prepared["unit"].to_numpy() if "unit" in prepared else np.empty(0, dtype=object)
+    for resolution, period in periods.items():
+        frames: dict[str | None, pd.DataFrame] = {PLANT_KEY: _aggregate(prepared, period)}
+        for unit in np.unique(units):
+            mask = units == unit
+            frames[str(unit)] = _aggregate(prepared[mask], period[mask])
+        for unit, frame in frames.items():
+            levels[(resolution, unit)] = Level(frame.index.asi8, frame)
+    return levels
+
+
+def units() -> list[str]:
+    dataset = get_dataset(HISTORY_FILE)
+    if dataset is None:
+        return []
+    pyramid = dataset.derived("rollup_pyramid", _build_pyramid)
+    return sorted({PLANT if unit is PLANT_KEY else unit for _, unit in pyramid})
+
+
+def load_history(
+    metric: str,
+    unit: str = PLANT,
+    resolution: str = "auto",
+    stat: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    max_points: int = 500,
+) -> dict[str, Any] | None:
+    """A chart-ready series of at most ``max_points`` points; ``None`` if the history or unit is unknown."""
+    dataset = get_dataset(HISTORY_FILE)
+    if dataset is None:
+        return None
+    pyramid = dataset.derived("rollup_pyramid", _build_pyramid)
+    key = PLANT_KEY if unit.casefold() == PLANT else unit.casefold()
+    if (RESOLUTIONS[0], key) not in pyramid:
+        return None
+
+    if resolution == "auto":
+        # The finest level that fits the budget, else the coarsest (thinned below).
+        for resolution in RESOLUTIONS:
+            window = pyramid[(resolution, key)].between(start, end)
+            if len(window.index) <= max_points:
+                break
+    else:
+        window = pyramid[(resolution, key)].between(start, end)
+
+    stat = stat or METRICS[metric][1]
+    values = window[f"{metric}_{stat}"].to_numpy(dtype="float64")
+    positions = np.flatnonzero(~np.isnan(values))
+    positions = positions[lttb(window.index.asi8[positions], values[positions], max_points)]
+    window = window.iloc[positions]
+
+    points = pd.DataFrame(
+        {
+            "timestamp": window.index.strftime("%Y-%m-%dT%H:%M:%S"),
+            "value": window[f"{metric}_{stat}"].to_numpy(),
+            "count": window["count"].to_numpy(),
+            **{name: window[f"{metric}_{name}"].to_numpy() for name in STATS},
+        }
+    )
+    return {
+        "metric": metric,
+        "unit": unit,
+        "resolution": resolution,
+        "stat": stat,
+        "points": frame_to_records(points),
+    }
@@ -0,0 +1,112 @@
+"""Periodic writer of KPI snapshots and rollups into ``kpi_snapshots``.
+
+Every interval the incremental KPI aggregator is refreshed and:
+
+* one ``granularity="overall"`` snapshot is inserted (what ``/kpis/summary``
+  and ``/kpis/snapshots`` read); a TTL index expires them after
+  ``KPI_SNAPSHOT_TTL_DAYS``, and
+* hourly, daily and per-unit rollups whose values changed since the previous
+  run are upserted in a single ``bulk_write``, keyed by ``(granularity, key)``.
+
+The breakdowns are computed in the I/O pool, off the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.db.indexes import KPI_FIELDS
+from app.services.executor import run_io
+from app.services.kpi_aggregator import KPIAggregator
+from app.services.kpi_service import get_aggregator
+
+logger = logging.getLogger(__name__)
+
+OVERALL = "overall"
+ROLLUP_DIMENSIONS = ("hour", "day", "unit")
+
+_last_written: dict[tuple[str, str], tuple[Any, ...]] = {}
+_task: asyncio.Task | None = None
+
+
+def _kpis(values: dict[str, Any]) -> dict[str, Any]:
+    return {name: values[name] for name in KPI_FIELDS}
+
+
+def _rollup_operations(aggregator: KPIAggregator, now: datetime) -> list[UpdateOne]:
+    """Upserts for the rollups that changed since the last run; forgets rollups that no longer exist."""
+    global _last_written
+    written = {}
+    operations = []
+    for dimension in ROLLUP_DIMENSIONS:
+        for key, values in aggregator.breakdown(dimension).items():
+            fingerprint = (values["readings"], *_kpis(values).values())
+            written[(dimension, key)] = fingerprint
+            if _last_written.get((dimension, key)) == fingerprint:
+                continue
+            operations.append(
+                UpdateOne(
+                    {"granularity": dimension, "key": key},
+                    {"$set": {"timestamp": now, "readings": values["readings"], **_kpis(values)}},
+                    upsert=True,
+                )
+            )
+    _last_written = written
+    return operations
+
+
+async def write_snapshots(db) -> int:
+    """Write one overall snapshot plus changed rollups; returns the number of documents written."""
+    aggregator = get_aggregator()
+    if not await run_io(aggregator.refresh):
+        return 0
+
+    now = datetime.now(timezone.utc)
+    await db.kpi_snapshots.insert_one({"granularity": OVERALL, "timestamp": now, **_kpis(aggregator.summary())})
+
+    operations = await run_io(_rollup_operations, aggregator, now)
+
+    for start in range(0, len(operations), settings.kpi_snapshot_batch_size):
+        await db.kpi_snapshots.bulk_write(
+            operations[start : start + settings.kpi_snapshot_batch_size], ordered=False
+        )
+    return 1 + len(operations)
+
+
+async def run_snapshot_writer(db, interval: float) -> None:
+    while True:
+        try:
+            written = await write_snapshots(db)
+            logger.debug("Wrote %d KPI snapshot documents", written)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # A failed run (e.g. Mongo briefly unavailable) must not stop the schedule;
+            # forget what was written so the next run re-sends every rollup.
+            _last_written.clear()
+            logger.exception("KPI snapshot run failed")
+        await asyncio.sleep(interval)
+
+
+def start_snapshot_writer(db) -> None:
+    global _task
+    if db is None or not settings.kpi_snapshot_enabled or _task is not None:
+        return
+    _task = asyncio.create_task(run_snapshot_writer(db, settings.kpi_snapshot_interval_seconds))
+
+
+async def stop_snapshot_writer() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,57 @@
+"""Newline-delimited JSON and server-sent event streaming.
+
+Services expose generators that yield lists of records one frame slice at a
+time; this module encodes those chunks as NDJSON so the first rows go out
+before the rest of the series has been converted. Encoding goes through
+``json_codec``, like the regular responses. Incremental replies (chatbot
+tokens) are sent as SSE events instead.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncIterable, Iterable, Iterator, Mapping
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.services.json_codec import dumps, dumps_lines
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One JSON record per line when streaming."}
+}
+SSE_MEDIA_TYPE = "text/event-stream"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def encode_ndjson(chunks: Iterable[list[dict[str, Any]]]) -> Iterator[bytes]:
+    for records in chunks:
+        if records:
+            yield dumps_lines(records)
+
+
+def ndjson_response(
+    chunks: Iterable[list[dict[str, Any]]], headers: Mapping[str, str] | None = None
+) -> StreamingResponse:
+    # A synchronous iterator is consumed in Starlette's threadpool, off the event loop.
+    return StreamingResponse(encode_ndjson(chunks), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def to_json(data: Any) -> str:
+    return dumps(data).decode()
+
+
+def sse_frame(event: str, payload: str) -> bytes:
+    """One SSE event whose data is the already-encoded JSON ``payload``."""
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+def encode_sse(event: str, data: Any) -> bytes:
+    return sse_frame(event, to_json(data))
+
+
+def sse_response(events: AsyncIterable[bytes]) -> StreamingResponse:
+    return StreamingResponse(events, media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
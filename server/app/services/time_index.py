@@ -0,0 +1,126 @@
+"""Sorted timestamp index used for time-range queries and cursor pagination.
+
+Rows are ordered by ``(timestamp, row position)``; rows without a parseable
+timestamp sort last. Time windows are located with binary search, so a query
+costs O(log n + k) once the index has been built for a dataset version.
+
+Cursors are keyset cursors: they encode the sort key of the last row returned,
+so they stay valid when new rows are appended to the underlying file.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MISSING_KEY = np.iinfo(np.int64).max
+# Bounds outside the nanosecond range are clamped so they filter instead of
+# overflowing; MISSING_KEY stays reserved for rows without a timestamp.
+MIN_KEY = int(pd.Timestamp.min.value)
+MAX_KEY = MISSING_KEY - 1
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_key(value: datetime) -> int:
+    """UTC nanoseconds since the epoch of ``value`` (naive values are taken as UTC), clamped to the key range."""
+    micros = (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+    offset = value.utcoffset()
+    if offset:
+        micros -= offset // _MICROSECOND
+    return min(max(micros * 1000, MIN_KEY), MAX_KEY)
+
+
+def encode_cursor(key: int, position: int) -> str:
+    payload = json.dumps([int(key), int(position)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[int, int]:
+    """Decode a cursor produced by ``encode_cursor``; raises ``ValueError`` if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key, position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(key), int(position)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def time_keys(frame: pd.DataFrame, time_col: str | None, positions: np.ndarray) -> np.ndarray:
+    """Sort keys (UTC nanoseconds) for the rows at ``positions``; unparseable times sort last."""
+    if time_col is None:
+        return np.full(len(positions), MISSING_KEY, dtype=np.int64)
+    times = pd.to_datetime(frame[time_col].iloc[positions], errors="coerce")
+    if getattr(times.dt, "tz", None) is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+    values = times.to_numpy(dtype="datetime64[ns]")
+    keys = values.view(np.int64).copy()
+    keys[np.isnat(values)] = MISSING_KEY
+    return keys
+
+
+class TimeIndex:
+    def __init__(self, keys: np.ndarray, positions: np.ndarray) -> None:
+        self.keys = keys
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, positions: np.ndarray) -> "TimeIndex":
+        order = np.argsort(keys, kind="stable")
+        return cls(keys[order], np.asarray(positions, dtype=np.int64)[order])
+
+    @classmethod
+    def build(
+        cls,
+        frame: pd.DataFrame,
+        time_col: str | None,
+        positions: np.ndarray | None = None,
+    ) -> "TimeIndex":
+        """Index ``frame`` rows (optionally only ``positions``) by ``time_col``."""
+        if positions is None:
+            positions = np.arange(len(frame.index), dtype=np.int64)
+        return cls.from_keys(time_keys(frame, time_col, positions), positions)
+
+    def window(self, start: datetime | None = None, end: datetime | None = None) -> tuple[int, int]:
+        """Half-open range of index slots whose timestamps fall in ``[start, end]``."""
+        if start is None and end is None:
+            return 0, len(self.keys)
+        lo = 0 if start is None else int(np.searchsorted(self.keys, to_key(start), "left"))
+        if end is None:
+            hi = int(np.searchsorted(self.keys, MISSING_KEY, "left"))
+        else:
+            hi = int(np.searchsorted(self.keys, to_key(end), "right"))
+        return lo, max(lo, hi)
+
+    def _seek(self, key: int, position: int) -> int:
+        # Slot just after (key, position); ties on key are ordered by row position.
+        first = int(np.searchsorted(self.keys, key, "left"))
+        last = int(np.searchsorted(self.keys, key, "right"))
+        return first + int(np.searchsorted(self.positions[first:last], position, "right"))
+
+    def page(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[np.ndarray, str | None]:
+        """Row positions for one page plus the cursor of the next page, if any."""
+        lo, hi = self.window(start, end)
+        if cursor is not None:
+            lo = max(lo, self._seek(*decode_cursor(cursor)))
+        stop = hi if limit is None else min(hi, lo + limit)
+        stop = max(lo, stop)
+
+        next_cursor = None
+        if lo < stop < hi:
+            next_cursor = encode_cursor(self.keys[stop - 1], self.positions[stop - 1])
+        return self.positions[lo:stop], next_cursor
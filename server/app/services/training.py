@@ -0,0 +1,225 @@
+"""Reproducible training of the anomaly and forecast models.
+
+Replaces the interactive notebooks with one pipeline (``python -m app.cli
+train``):
+
+1. ``load``: read the historical dataset and clean it as the notebooks did
+   (duplicates dropped, median-filled gaps, non-positive readings removed,
+   ``total_energy`` and ``SEC`` derived).
+2. ``anomaly``: fit the global Isolation Forest and one per unit.
+3. ``forecast``: fit a daily model per metric (energy, SEC) for the whole
+   plant and for each unit.
+4. ``outputs``: score the history and write the anomaly and 30-day forecast
+   CSVs the API serves into ``data_dir``.
+
+Independent fits in a stage are spread over a process pool, and each stage
+reports its wall-clock time next to the summed fit time so the parallel
+speedup is visible. Each kind of model is saved as a new version in the model
+store and only activated once its whole set has been written.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from app.services import model_store
+from app.services.anomaly_scoring import (
+    ENERGY_INPUTS,
+    FEATURES,
+    GLOBAL_MODEL,
+    MODEL_KIND as ANOMALY_KIND,
+    UNIT_MODEL_PREFIX,
+    feature_frame,
+    load_models,
+    score_frame,
+)
+from app.services.forecast_models import MODEL_KIND as FORECAST_KIND, PLANT, create_model, future_dates
+
+HISTORY_FILE = "refinery_energy_sec_historical_prophet.csv"
+ANOMALY_OUTPUT = "final_refinery_data_with_anomalies.csv"
+ISOLATION_FOREST_PARAMS = {"n_estimators": 100, "contamination": 0.05, "random_state": 42}
+# metric -> (history column, daily aggregation, output file, Prophet options from the notebook)
+FORECAST_METRICS: dict[str, tuple[str, str, str, dict[str, Any]]] = {
+    "energy": (
+        "total_energy",
+        "sum",
+        "energy_forecast.csv",
+        {"yearly_seasonality": True, "weekly_seasonality": True, "changepoint_prior_scale": 0.1},
+    ),
+    "sec": ("SEC", "mean", "sec_forecast.csv", {"yearly_seasonality": True, "changepoint_prior_scale": 0.1}),
+}
+
+
+@dataclass
+class StageTiming:
+    name: str
+    wall_seconds: float
+    fit_seconds: float = 0.0
+    tasks: int = 0
+
+    def describe(self) -> str:
+        if not self.tasks:
+            return f"{self.name}: {self.wall_seconds:.2f}s"
+        speedup = self.fit_seconds / self.wall_seconds if self.wall_seconds else 0.0
+        return (
+            f"{self.name}: {self.wall_seconds:.2f}s wall, {self.fit_seconds:.2f}s of fits "
+            f"across {self.tasks} models ({speedup:.1f}x)"
+        )
+
+
+@dataclass
+class TrainingReport:
+    versions: dict[str, str] = field(default_factory=dict)
+    outputs: list[Path] = field(default_factory=list)
+    stages: list[StageTiming] = field(default_factory=list)
+
+
+def load_history(path: Path) -> pd.DataFrame:
+    frame = pd.read_csv(path).drop_duplicates()
+    date_col = "date" if "date" in frame.columns else "ds"
+    frame[date_col] = pd.to_datetime(frame[date_col], errors="coerce")
+    frame = frame.dropna(subset=[date_col]).rename(columns={date_col: "date"})
+    frame = frame.fillna(frame.median(numeric_only=True))
+
+    inputs = [*ENERGY_INPUTS, "production_tons"]
+    frame = frame[(frame[inputs] > 0).all(axis=1)].reset_index(drop=True)
+    frame["total_energy"] = frame[list(ENERGY_INPUTS)].sum(axis=1)
+    frame["SEC"] = frame["total_energy"] / frame["production_tons"]
+    return frame
+
+
+def daily_series(frame: pd.DataFrame, column: str, how: str, unit: str = PLANT) -> pd.DataFrame:
+    """``ds``/``y`` frame of ``column`` aggregated per day, for one unit or the whole plant."""
+    if unit != PLANT:
+        frame = frame[frame["unit_name"] == unit]
+    daily = frame.groupby(frame["date"].dt.normalize())[column].agg(how)
+    return pd.DataFrame({"ds": daily.index, "y": daily.to_numpy()})
+
+
+def _fit_isolation_forest(name: str, matrix: np.ndarray) -> tuple[str, Any, float]:
+    from sklearn.ensemble import IsolationForest
+
+    started = time.perf_counter()
+    model = IsolationForest(**ISOLATION_FOREST_PARAMS).fit(matrix)
+    return name, model, time.perf_counter() - started
+
+
+def _fit_forecast(name: str, history: pd.DataFrame, backend: str, options: dict[str, Any]) -> tuple[str, Any, float]:
+    started = time.perf_counter()
+    model = create_model(backend, **options).fit(history)
+    return name, model, time.perf_counter() - started
+
+
+def _fan_out(
+    func: Callable[..., tuple[str, Any, float]], tasks: list[tuple[Any, ...]], workers: int, stage: str
+) -> tuple[dict[str, Any], StageTiming]:
+    started = time.perf_counter()
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(func, *zip(*tasks)))
+    else:
+        results = [func(*task) for task in tasks]
+    timing = StageTiming(stage, time.perf_counter() - started, sum(seconds for *_, seconds in results), len(results))
+    return {name: model for name, model, _ in results}, timing
+
+
+def _write_csv(frame: pd.DataFrame, path: Path) -> None:
+    # Readers (the dataset registry) must never see a half-written file.
+    staging = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    frame.to_csv(staging, index=False)
+    os.replace(staging, path)
+
+
+def train(
+    history_path: Path,
+    data_dir: Path,
+    workers: int,
+    horizon: int = 30,
+    anomaly: bool = True,
+    forecast: bool = True,
+    per_unit: bool = True,
+    backend: str = "auto",
+    write_outputs: bool = True,
+    log: Callable[[str], None] = print,
+) -> TrainingReport:
+    report = TrainingReport()
+    trained_at = datetime.now(timezone.utc).isoformat()
+
+    def record(timing: StageTiming) -> None:
+        report.stages.append(timing)
+        log(timing.describe())
+
+    started = time.perf_counter()
+    history = load_history(history_path)
+    units = sorted(history["unit_name"].astype(str).unique()) if "unit_name" in history else []
+    record(StageTiming("load", time.perf_counter() - started))
+    log(f"  {len(history)} rows, {len(units)} units from {history_path}")
+
+    if anomaly:
+        matrix = feature_frame(history)[list(FEATURES)].to_numpy()
+        tasks = [(GLOBAL_MODEL, matrix)]
+        if per_unit:
+            unit_names = history["unit_name"].astype(str).to_numpy()
+            tasks += [(f"{UNIT_MODEL_PREFIX}{unit}", matrix[unit_names == unit]) for unit in units]
+        anomaly_models, timing = _fan_out(_fit_isolation_forest, tasks, workers, "anomaly")
+        record(timing)
+        report.versions[ANOMALY_KIND] = model_store.save_artifacts(
+            ANOMALY_KIND,
+            anomaly_models,
+            {
+                "trained_at": trained_at,
+                "history": str(history_path),
+                "rows": len(history),
+                "features": list(FEATURES),
+                "sec_mean": float(history["SEC"].mean()),
+                "params": ISOLATION_FOREST_PARAMS,
+            },
+        )
+
+    if forecast:
+        tasks = []
+        for metric, (column, how, _, options) in FORECAST_METRICS.items():
+            for unit in [PLANT, *(units if per_unit else [])]:
+                tasks.append((f"{metric}:{unit}", daily_series(history, column, how, unit), backend, options))
+        forecast_models, timing = _fan_out(_fit_forecast, tasks, workers, "forecast")
+        record(timing)
+        report.versions[FORECAST_KIND] = model_store.save_artifacts(
+            FORECAST_KIND,
+            forecast_models,
+            {
+                "trained_at": trained_at,
+                "history": str(history_path),
+                "rows": len(history),
+                "backend": next(iter(forecast_models.values())).backend,
+                "metrics": {metric: spec[0] for metric, spec in FORECAST_METRICS.items()},
+                "units": [PLANT, *(units if per_unit else [])],
+            },
+        )
+
+    if write_outputs:
+        started = time.perf_counter()
+        if anomaly:
+            scored = score_frame(history, load_models())
+            output = history.assign(
+                anomaly=scored["anomaly"].fillna(False).astype(int),
+                anomaly_score=scored["score"],
+                severity=scored["severity"],
+            )
+            report.outputs.append(data_dir / ANOMALY_OUTPUT)
+            _write_csv(output, report.outputs[-1])
+        if forecast:
+            for metric, (_, _, file_name, _) in FORECAST_METRICS.items():
+                model = forecast_models[f"{metric}:{PLANT}"]
+                report.outputs.append(data_dir / file_name)
+                _write_csv(model.predict(future_dates(model, horizon)), report.outputs[-1])
+        record(StageTiming("outputs", time.perf_counter() - started))
+
+    return report
@@ -0,0 +1,106 @@
+"""Cost of pushing alert batches to hundreds of subscribed dashboards.
+
+Subscribes ``--clients`` consumers to an ``AlertHub`` (a third unfiltered, the
+rest filtered on one or two units and/or severities), publishes ``--batches``
+batches of ``--alerts`` alerts and reports, per batch:
+
+* per_client_encode: the naive fan-out, filtering and ``json.dumps`` per client
+* publish: ``AlertHub.publish`` (encode once, group, join per client)
+* delivered: from publish until every consumer task has received the batch
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_alert_fanout --clients 100 500 --alerts 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from app.services.alert_hub import AlertHub
+
+UNITS = ["VDU", "NCU", "CDU", "FCC", "HCU"]
+SEVERITIES = ["low", "medium", "high"]
+
+
+def _alerts(count: int, rng: np.random.Generator) -> list[dict]:
+    return [
+        {
+            "id": f"bench:{index}",
+            "message": "Anomaly detected.",
+            "severity": SEVERITIES[rng.integers(len(SEVERITIES))],
+            "timestamp": "2024-01-01T00:00:00+00:00",
+            "unit": UNITS[rng.integers(len(UNITS))],
+            "score": float(rng.random()),
+            "source": "bench",
+        }
+        for index in range(count)
+    ]
+
+
+def _filters(index: int, rng: np.random.Generator) -> tuple[list[str] | None, list[str] | None]:
+    if index % 3 == 0:
+        return None, None
+    units = list(rng.choice(UNITS, size=1 + index % 2, replace=False))
+    severities = list(rng.choice(SEVERITIES, size=2, replace=False)) if index % 3 == 2 else None
+    return units, severities
+
+
+def _per_client_encode(alerts: list[dict], filters: list[tuple[list[str] | None, list[str] | None]]) -> None:
+    for units, severities in filters:
+        matched = [
+            alert
+            for alert in alerts
+            if (units is None or alert["unit"] in units) and (severities is None or alert["severity"] in severities)
+        ]
+        if matched:
+            json.dumps(matched)
+
+
+async def _run(clients: int, alerts: int, batches: int) -> dict[str, list[float]]:
+    rng = np.random.default_rng(clients)
+    hub = AlertHub(queue_size=batches + 1, max_subscribers=clients)
+    filters = [_filters(index, rng) for index in range(clients)]
+    subscriptions = [hub.subscribe(units, severities) for units, severities in filters]
+    samples: dict[str, list[float]] = {"per_client_encode": [], "publish": [], "delivered": []}
+
+    for _ in range(batches):
+        batch = _alerts(alerts, rng)
+        started = time.perf_counter()
+        _per_client_encode(batch, filters)
+        samples["per_client_encode"].append((time.perf_counter() - started) * 1000)
+
+        receivers = [asyncio.create_task(subscription.next(60.0)) for subscription in subscriptions]
+        await asyncio.sleep(0)  # let every receiver start waiting
+        started = time.perf_counter()
+        hub.publish(batch)
+        samples["publish"].append((time.perf_counter() - started) * 1000)
+        # Clients whose filters matched nothing in this batch are not waited for.
+        await asyncio.gather(*(task for task, sub in zip(receivers, subscriptions) if not sub.queue.empty()))
+        samples["delivered"].append((time.perf_counter() - started) * 1000)
+        for task in receivers:
+            task.cancel()
+    hub.close()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--batches", type=int, default=50)
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        samples = asyncio.run(_run(clients, args.alerts, args.batches))
+        for name, values in samples.items():
+            p50, p99 = np.percentile(values, [50, 99])
+            print(f"clients={clients:<5} {name:<18} p50={p50:7.3f} ms  p99={p99:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
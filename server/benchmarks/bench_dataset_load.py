@@ -0,0 +1,125 @@
+"""Compare cold/warm load time and resident memory of CSV vs Arrow sidecar reads.
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_dataset_load --rows 1000000
+
+Each mode runs in a fresh interpreter so resident memory is measured in isolation.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services import columnar_store
+
+KPI_COLUMNS = ["total_energy", "SEC", "anomaly"]
+MODES = ["csv", "csv_usecols", "arrow", "arrow_columns"]
+
+
+def _generate(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(42)
+    units = np.array(["VDU", "NCU", "CDU", "FCC", "HCU"])
+    frame = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=rows, freq="min").astype(str),
+            "unit_name": units[rng.integers(0, len(units), rows)],
+            "electricity_kwh": rng.normal(80_000, 8_000, rows),
+            "steam_usage": rng.normal(45_000, 5_000, rows),
+            "fuel_usage": rng.normal(33_000, 4_000, rows),
+            "production_tons": rng.normal(2_000, 200, rows),
+        }
+    )
+    frame["total_energy"] = frame["electricity_kwh"] + frame["steam_usage"] + frame["fuel_usage"]
+    frame["SEC"] = frame["total_energy"] / frame["production_tons"]
+    frame["anomaly"] = (rng.random(rows) < 0.05).astype(int)
+    frame.to_csv(path, index=False)
+
+
+def _load(mode: str, csv_path: Path) -> pd.DataFrame:
+    sidecar = columnar_store.sidecar_path(csv_path)
+    if mode == "csv":
+        return pd.read_csv(csv_path)
+    if mode == "csv_usecols":
+        return pd.read_csv(csv_path, usecols=KPI_COLUMNS)
+    if mode == "arrow":
+        return columnar_store.read_frame(sidecar)
+    return columnar_store.read_frame(sidecar, KPI_COLUMNS)
+
+
+def _rss_mb() -> float:
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        return int(statm.read_text().split()[1]) * resource.getpagesize() / 1024 / 1024
+    # Fall back to peak RSS (KiB on Linux, bytes on macOS) where /proc is unavailable.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker(mode: str, csv_path: Path) -> None:
+    baseline = _rss_mb()
+    started = time.perf_counter()
+    frame = _load(mode, csv_path)
+    cold = time.perf_counter() - started
+    frame["total_energy"].sum()
+    resident = _rss_mb() - baseline
+
+    warm_runs = []
+    for _ in range(3):
+        started = time.perf_counter()
+        _load(mode, csv_path)
+        warm_runs.append(time.perf_counter() - started)
+
+    print(
+        json.dumps(
+            {
+                "mode": mode,
+                "cold_s": cold,
+                "warm_s": min(warm_runs),
+                "rss_mb": resident,
+            }
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, Path(args.path))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "final_refinery_data_with_anomalies.csv"
+        _generate(csv_path, args.rows)
+        started = time.perf_counter()
+        columnar_store.convert(csv_path)
+        print(f"rows={args.rows} csv={csv_path.stat().st_size / 1e6:.1f}MB "
+              f"arrow={columnar_store.sidecar_path(csv_path).stat().st_size / 1e6:.1f}MB "
+              f"convert={time.perf_counter() - started:.2f}s")
+        print(f"{'mode':<14}{'cold (s)':>10}{'warm (s)':>10}{'RSS (MB)':>10}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_dataset_load", "--worker", mode, "--path", str(csv_path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:<14}{result['cold_s']:>10.3f}{result['warm_s']:>10.3f}{result['rss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""p50/p99 latency of ``/health`` probes under concurrent ``/anomalies`` traffic.
+
+Runs the app in-process (httpx ``ASGITransport``) once with service calls made
+inline on the event loop (``IO_WORKERS=0``, the previous behaviour) and once
+with the shared worker pool, so the effect of offloading is visible in the
+``/health`` tail latency.
+
+Usage (from ``server/``, with ``DATA_DIR`` pointing at the CSVs)::
+
+    python -m benchmarks.bench_event_loop --requests 400 --concurrency 8
+
+``--cold`` drops the dataset cache before every anomaly request to include the
+CSV read in each call. Health probes are sent on a fixed schedule and timed
+from their scheduled send time; with inline calls the loop may not get to send
+more than one before the anomaly traffic finishes. Requires ``httpx``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from app.config import settings
+from app.main import app
+from app.services import executor
+from app.services.dataset_registry import registry
+
+
+async def _timed(client: httpx.AsyncClient, url: str, samples: list[float], since: float) -> None:
+    response = await client.get(url)
+    response.raise_for_status()
+    samples.append((time.perf_counter() - since) * 1000)
+
+
+async def _run(requests: int, concurrency: int, limit: int, cold: bool, interval: float) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {"health": [], "anomalies": []}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(f"/anomalies?limit={limit}")  # warm the dataset cache and index
+        remaining = iter(range(requests))
+
+        async def anomaly_worker() -> None:
+            for _ in remaining:
+                if cold:
+                    registry.invalidate()
+                await _timed(client, f"/anomalies?limit={limit}", samples["anomalies"], time.perf_counter())
+
+        async def health_probe(done: asyncio.Event) -> None:
+            # Open-loop probe: latency is measured from the scheduled send time, so
+            # time spent waiting for a blocked event loop is counted.
+            probes = []
+            scheduled = time.perf_counter()
+            while not done.is_set():
+                while scheduled <= time.perf_counter():
+                    probes.append(asyncio.create_task(_timed(client, "/health", samples["health"], scheduled)))
+                    scheduled += interval
+                await asyncio.sleep(scheduled - time.perf_counter())
+            await asyncio.gather(*probes)
+
+        done = asyncio.Event()
+        probe = asyncio.create_task(health_probe(done))
+        await asyncio.gather(*(anomaly_worker() for _ in range(concurrency)))
+        done.set()
+        await probe
+    return samples
+
+
+def _report(mode: str, samples: dict[str, list[float]]) -> None:
+    for name, values in samples.items():
+        p50, p99 = np.percentile(values, [50, 99])
+        print(f"{mode:<8} {name:<10} n={len(values):<5} p50={p50:8.2f} ms  p99={p99:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=settings.io_workers or 8)
+    parser.add_argument("--probe-interval-ms", type=float, default=5.0)
+    parser.add_argument("--cold", action="store_true")
+    args = parser.parse_args()
+
+    for mode, workers in (("inline", 0), ("pool", args.workers)):
+        settings.io_workers = workers
+        executor.shutdown_executors()
+        samples = asyncio.run(
+            _run(args.requests, args.concurrency, args.limit, args.cold, args.probe_interval_ms / 1000)
+        )
+        _report(mode, samples)
+    executor.shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Chart payloads from the rollup pyramid vs returning raw history rows.
+
+Writes a synthetic hourly history (five units, ``--years`` years) to a
+temporary ``DATA_DIR`` and reports:
+
+* the one-off pyramid build for that dataset version
+* per query: latency and JSON bytes of ``load_history`` with ``max_points``
+  next to the bytes of the raw rows the same range would otherwise ship
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_history --years 5 --max-points 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services import rollups
+from app.services.dataset_registry import get_dataset, registry
+from app.services.training import HISTORY_FILE
+
+UNITS = np.array(["VDU", "NCU", "CDU", "FCC", "HCU"])
+
+
+def _generate(path: Path, years: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    hours = pd.date_range("2020-01-01", periods=years * 365 * 24, freq="h")
+    rows = len(hours) * len(UNITS)
+    frame = pd.DataFrame(
+        {
+            "date": np.repeat(hours, len(UNITS)).astype(str),
+            "unit_name": np.tile(UNITS, len(hours)),
+            "electricity_kwh": rng.normal(80_000, 8_000, rows),
+            "steam_usage": rng.normal(45_000, 5_000, rows),
+            "fuel_usage": rng.normal(33_000, 4_000, rows),
+            "production_tons": rng.normal(2_000, 200, rows),
+        }
+    )
+    frame["total_energy"] = frame["electricity_kwh"] + frame["steam_usage"] + frame["fuel_usage"]
+    frame["SEC"] = frame["total_energy"] / frame["production_tons"]
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--max-points", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.data_dir = directory
+        registry.invalidate()
+        frame = _generate(Path(directory) / HISTORY_FILE, args.years)
+        get_dataset(HISTORY_FILE)
+
+        started = time.perf_counter()
+        rollups.units()
+        print(f"pyramid build: {time.perf_counter() - started:.2f}s for {len(frame)} rows")
+
+        end = pd.Timestamp("2020-01-01") + pd.DateOffset(years=args.years)
+        queries = {
+            "all, full range": ("all", None),
+            "VDU, full range": ("VDU", None),
+            "VDU, last 90 days": ("VDU", end - pd.Timedelta(days=90)),
+            "VDU, last 7 days": ("VDU", end - pd.Timedelta(days=7)),
+        }
+        print(f"{'query':<20} {'resolution':<10} {'points':>7} {'ms':>8} {'bytes':>10} {'raw bytes':>12}")
+        for name, (unit, start) in queries.items():
+            started = time.perf_counter()
+            series = rollups.load_history("energy", unit, "auto", None, start, None, args.max_points)
+            elapsed = (time.perf_counter() - started) * 1000
+            rows = frame if unit == "all" else frame[frame["unit_name"] == unit]
+            if start is not None:
+                rows = rows[pd.to_datetime(rows["date"]) >= start]
+            raw_bytes = len(rows.to_json(orient="records"))
+            print(
+                f"{name:<20} {series['resolution']:<10} {len(series['points']):>7} {elapsed:>8.2f} "
+                f"{len(json.dumps(series)):>10,} {raw_bytes:>12,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
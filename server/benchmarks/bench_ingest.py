@@ -0,0 +1,91 @@
+"""Throughput of ``POST /ingest``'s work on 1k / 10k / 100k-reading batches.
+
+Times, per batch size, against a fresh ``LiveStore``:
+
+* per_row_deque: the naive alternative, one dict per reading with SEC computed
+  in Python, appended to a per-unit ``collections.deque``
+* json / ndjson: ``ingest_payload`` on the raw request body (decode, vectorised
+  SEC, one slice assignment per unit)
+* kpi_window: ``LiveStore.summaries`` over the last 10k readings of each unit,
+  reduced straight from the buffer views
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_ingest --rows 1000 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+import pandas as pd
+
+from app.services import ingest_service
+from app.services.ingest_service import LiveStore, ingest_payload
+
+UNITS = np.array(["VDU", "NCU", "CDU", "FCC", "HCU"])
+
+
+def _readings(rows: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=rows, freq="s").strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "unit_name": UNITS[rng.integers(0, len(UNITS), rows)],
+            "electricity_kwh": rng.normal(80_000, 8_000, rows),
+            "steam_usage": rng.normal(45_000, 5_000, rows),
+            "fuel_usage": rng.normal(33_000, 4_000, rows),
+            "production_tons": rng.normal(2_000, 200, rows),
+        }
+    )
+    return frame.to_dict("records")
+
+
+def _per_row_deque(body: bytes, capacity: int) -> None:
+    buffers: dict[str, deque] = defaultdict(lambda: deque(maxlen=capacity))
+    for row in json.loads(body):
+        energy = row["electricity_kwh"] + row["steam_usage"] + row["fuel_usage"]
+        production = row["production_tons"]
+        row["total_energy"] = energy
+        row["SEC"] = energy / production if production > 0 else None
+        row["timestamp"] = pd.Timestamp(row["timestamp"])
+        buffers[row["unit_name"]].append(row)
+
+
+def _timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--capacity", type=int, default=65_536)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'stage':<14} {'seconds':>9} {'rows/s':>12}")
+    for rows in args.rows:
+        readings = _readings(rows, seed=rows)
+        body = json.dumps(readings).encode()
+        ndjson = b"\n".join(json.dumps(reading).encode() for reading in readings)
+        ingest_service.live_store = LiveStore(args.capacity, 256)
+        stages = {
+            "per_row_deque": lambda: _per_row_deque(body, args.capacity),
+            "json": lambda: ingest_payload(body),
+            "ndjson": lambda: ingest_payload(ndjson, ndjson=True),
+            "kpi_window": lambda: ingest_service.live_store.summaries(window=10_000),
+        }
+        for name, stage in stages.items():
+            seconds = _timed(stage)
+            print(f"{rows:>8} {name:<14} {seconds:>9.4f} {rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
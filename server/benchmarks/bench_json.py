@@ -0,0 +1,87 @@
+"""Response encoding: FastAPI's response_model path vs ``FastJSONResponse``.
+
+Loads real pages from the services (``DATA_DIR`` must point at the CSVs) and
+times, per payload:
+
+* model: validating the records against the route's ``response_model`` and
+  dumping them in JSON mode, then ``json.dumps`` as Starlette's
+  ``JSONResponse`` does (what every list route did before)
+* stdlib: ``FastJSONResponse`` rendering without orjson
+* orjson: ``FastJSONResponse`` rendering with orjson (the default when installed)
+
+and, for the columnar format, converting arrays with ``tolist()`` before
+``json.dumps`` vs handing the arrays to orjson directly.
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_json --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+
+from app.models.schemas import AnomalyRecord, ForecastRecord
+from app.services import json_codec
+from app.services.anomaly_service import load_anomalies, load_anomaly_columns
+from app.services.forecast_service import load_forecast, load_forecast_columns
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _starlette_dumps(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def _stdlib(content: Any) -> bytes:
+    orjson, json_codec.orjson = json_codec.orjson, None
+    try:
+        return json_codec.dumps(content)
+    finally:
+        json_codec.orjson = orjson
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    if json_codec.orjson is None:
+        raise SystemExit("orjson is not installed")
+
+    forecasts, _ = load_forecast("energy_forecast.csv", "energy", 2000)
+    anomalies, _ = load_anomalies(1000)
+    payloads = {
+        f"forecasts x{len(forecasts)}": (forecasts, TypeAdapter(list[ForecastRecord])),
+        f"anomalies x{len(anomalies)}": (anomalies, TypeAdapter(list[AnomalyRecord])),
+    }
+    print(f"{'payload':<18} {'model ms':>9} {'stdlib ms':>10} {'orjson ms':>10} {'speedup':>8}")
+    for name, (records, adapter) in payloads.items():
+        model = _timed(lambda: _starlette_dumps(adapter.dump_python(adapter.validate_python(records), mode="json")), args.repeat)
+        stdlib = _timed(lambda: _stdlib(records), args.repeat)
+        fast = _timed(lambda: json_codec.dumps(records), args.repeat)
+        print(f"{name:<18} {model:>9.2f} {stdlib:>10.2f} {fast:>10.2f} {model / fast:>7.1f}x")
+
+    forecast_columns, _ = load_forecast_columns("energy_forecast.csv", "energy", None)
+    anomaly_columns, _ = load_anomaly_columns(None)
+    print(f"\n{'columnar':<18} {'tolist ms':>9} {'orjson ms':>10} {'speedup':>8}")
+    for name, columns in {"forecasts": forecast_columns, "anomalies": anomaly_columns}.items():
+        listed = _timed(
+            lambda: _starlette_dumps({key: json_codec.array_values(values) for key, values in columns.items()}),
+            args.repeat,
+        )
+        fast = _timed(lambda: json_codec.dumps(columns), args.repeat)
+        print(f"{name:<18} {listed:>9.2f} {fast:>10.2f} {listed / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
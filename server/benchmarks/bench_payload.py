@@ -0,0 +1,76 @@
+"""Bytes on the wire and serve time of the time-series response formats.
+
+Requests each variant through the full app (response-model validation,
+encoding and the compression middleware) with httpx's ``ASGITransport`` and
+reports the mean time per request and the body size uncompressed, gzipped and
+brotli-compressed (when the brotli package is installed):
+
+* records: the default list of ``ForecastRecord`` / ``AnomalyRecord``
+* records_no_raw: the same without the ``raw`` copy of each source row
+* columnar: ``format=columnar`` (one array per field)
+* arrow: ``format=arrow`` (Arrow IPC stream)
+
+Usage (from ``server/``, with ``DATA_DIR`` pointing at the CSVs)::
+
+    python -m benchmarks.bench_payload --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.main import app
+from app.services.compression import brotli
+
+ENDPOINTS = {
+    "forecasts": ("/forecasts", {"limit": 2000}),
+    "anomalies": ("/anomalies", {"limit": 1000}),
+}
+VARIANTS = {
+    "records": {},
+    "records_no_raw": {"include_raw": "false"},
+    "columnar": {"format": "columnar"},
+    "arrow": {"format": "arrow"},
+}
+ENCODINGS = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+
+
+async def _measure(client: httpx.AsyncClient, path: str, params: dict, encoding: str, repeat: int) -> tuple[float, int]:
+    headers = {"accept-encoding": encoding}
+    response = await client.get(path, params=params, headers=headers)  # warm caches
+    response.raise_for_status()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        response = await client.get(path, params=params, headers=headers)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    # httpx decodes the body; the wire size is what the server declared.
+    return elapsed, int(response.headers.get("content-length", len(response.content)))
+
+
+async def _run(repeat: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'endpoint':<10} {'variant':<15} " + " ".join(f"{name + ' ms':>12} {name + ' bytes':>14}" for name in ENCODINGS))
+        for endpoint, (path, base) in ENDPOINTS.items():
+            for variant, params in VARIANTS.items():
+                if endpoint == "anomalies" and variant == "records_no_raw":
+                    continue
+                cells = []
+                for encoding in ENCODINGS:
+                    elapsed, size = await _measure(client, path, {**base, **params}, encoding, repeat)
+                    cells.append(f"{elapsed:>12.2f} {size:>14,}")
+                print(f"{endpoint:<10} {variant:<15} " + " ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
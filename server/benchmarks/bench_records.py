@@ -0,0 +1,87 @@
+"""Per-row cost of the legacy ``iterrows()`` serialisation vs ``app.services.records``.
+
+Usage (from ``server/``)::
+
+    python -m benchmarks.bench_records --limits 1000 2000
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from app.services.records import column_values, float_values, frame_to_records
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=rows, freq="h").astype(str),
+            "unit_name": rng.choice(["VDU", "NCU", "CDU"], rows),
+            "electricity_kwh": rng.normal(80_000, 8_000, rows),
+            "steam_usage": rng.normal(45_000, 5_000, rows),
+            "fuel_usage": rng.normal(33_000, 4_000, rows),
+            "production_tons": rng.normal(2_000, 200, rows),
+            "SEC": rng.normal(80, 5, rows),
+            "anomaly": np.ones(rows, dtype=int),
+            "anomaly_score": rng.random(rows),
+        }
+    )
+    frame.loc[frame.sample(frac=0.02, random_state=1).index, "anomaly_score"] = np.nan
+    return frame
+
+
+def _legacy(page: pd.DataFrame) -> list[dict]:
+    def safe_float(value):
+        try:
+            if pd.isna(value):
+                return None
+            return float(value)
+        except Exception:
+            return None
+
+    records = []
+    for _, row in page.iterrows():
+        records.append(
+            {
+                "timestamp": row.get("date"),
+                "score": safe_float(row.get("anomaly_score")),
+                "raw": row.to_dict(),
+            }
+        )
+    return records
+
+
+def _vectorised(page: pd.DataFrame) -> list[dict]:
+    return [
+        {"timestamp": timestamp, "score": score, "raw": raw}
+        for timestamp, score, raw in zip(
+            column_values(page, "date"),
+            float_values(page, "anomaly_score"),
+            frame_to_records(page),
+        )
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limits", type=int, nargs="+", default=[1000, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'limit':>6}{'iterrows (us/row)':>20}{'vectorised (us/row)':>22}{'speedup':>10}")
+    for limit in args.limits:
+        page = _frame(limit)
+        legacy = min(timeit.repeat(lambda: _legacy(page), number=1, repeat=args.repeat))
+        vectorised = min(timeit.repeat(lambda: _vectorised(page), number=1, repeat=args.repeat))
+        print(
+            f"{limit:>6}{legacy / limit * 1e6:>20.2f}{vectorised / limit * 1e6:>22.2f}"
+            f"{legacy / vectorised:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# Settings are read once at import; give the required ones a value before the app is imported.
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:1")
+os.environ.setdefault("JWT_SECRET", "test-secret")
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+
+UNREACHABLE_MONGO_URI = "mongodb://localhost:1"
+READINGS = """date,unit_name,total_energy,SEC,anomaly
+2024-01-01 00:00:00,CDU,100.0,2.0,0
+2024-01-01 01:00:00,VDU,300.0,4.0,1
+"""
+
+
+def test_kpi_endpoints_fall_back_to_csv_when_mongo_is_unreachable(monkeypatch, tmp_path):
+    (tmp_path / "final_refinery_data_with_anomalies.csv").write_text(READINGS)
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "mongo_uri", UNREACHABLE_MONGO_URI)
+    monkeypatch.setattr(settings, "mongo_server_selection_timeout_ms", 100)
+    monkeypatch.setattr(settings, "kpi_snapshot_enabled", False)
+
+    with TestClient(app) as client:
+        summary = client.get("/kpis/summary")
+        snapshots = client.get("/kpis/snapshots")
+        rollups = client.get("/kpis/rollups", params={"granularity": "unit"})
+
+    assert summary.status_code == 200
+    assert summary.json()["total_energy"] == 400.0
+    assert summary.json()["anomaly_rate"] == 0.5
+    assert snapshots.status_code == 200
+    assert snapshots.json() == []
+    assert rollups.status_code == 200
+    assert [group["key"] for group in rollups.json()] == ["VDU", "CDU"]
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.passwords import HashingBusy, HashingPool
+
+
+def _wait_for(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_cancelled_queued_call_keeps_counters_consistent():
+    pool = HashingPool(workers=1, max_pending=2)
+    release = threading.Event()
+
+    def fail() -> None:
+        raise ValueError("bad hash")
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.to_thread(_wait_for, lambda: pool.stats()["running"] == 1)
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        assert pool.stats()["queued"] == 1
+        with pytest.raises(HashingBusy):
+            await pool.run(release.wait)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        stats = pool.stats()
+        assert (stats["running"], stats["queued"], stats["completed"]) == (1, 0, 0)
+
+        release.set()
+        assert await running is True
+        with pytest.raises(ValueError):
+            await pool.run(fail)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert (stats["running"], stats["queued"]) == (0, 0)
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (1, 1, 1)